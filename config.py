@@ -5,7 +5,9 @@ This module manages application settings and environment variables.
 Reads API keys from .env file and defines constants used throughout the application.
 """
 
+import functools
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -22,6 +24,27 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 # Gemini model name (Vision supported - latest model)
 GEMINI_MODEL = "gemini-2.5-flash"
 
+# Gemini API request timeout (milliseconds)
+GEMINI_TIMEOUT_MS = 30_000
+
+# Longest image edge sent to Gemini (pixels). The model rescales large
+# images internally, so anything bigger only costs upload time.
+GEMINI_IMAGE_MAX_SIZE = 1024
+
+# Captures taken within this window (seconds) are analyzed in one request
+GEMINI_BATCH_WINDOW_SECONDS = 0.2
+
+# Maximum number of images sent in a single batched request
+GEMINI_BATCH_SIZE = 4
+
+# Maximum number of captures waiting for analysis; further captures are
+# rejected until the queue drains (bounds memory if the API stalls)
+GEMINI_MAX_PENDING = 8
+
+# Maximum number of batched requests in flight at the same time (also
+# sizes the API thread pool and HTTP connection pool)
+GEMINI_MAX_IN_FLIGHT = 2
+
 # Gemini system instruction - concise summary with multiple choice question
 GEMINI_SYSTEM_INSTRUCTION = """Analyze this educational image and provide:
 
@@ -47,7 +70,7 @@ D) [Option D]
 # =============================================================================
 
 # Project root directory
-BASE_DIR = Path(__file__).parent.absolute()
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 
 # Screenshots folder
 SCREENSHOTS_DIR = BASE_DIR / "screenshots"
@@ -55,6 +78,9 @@ SCREENSHOTS_DIR = BASE_DIR / "screenshots"
 # PowerPoint output folder
 OUTPUT_DIR = BASE_DIR / "output"
 
+# Bundled helper scripts (PDF export)
+RESOURCES_DIR = BASE_DIR / "resources"
+
 # =============================================================================
 # Application Settings
 # =============================================================================
@@ -65,12 +91,28 @@ HOTKEY = "ctrl+v"
 # Hotkey combination - direct capture (no AI)
 HOTKEY_DIRECT = "ctrl+b"
 
+# Hotkey combination - close the application (uncommon combination, since a
+# global hotkey also fires while other applications have focus)
+HOTKEY_QUIT = "ctrl+alt+q"
+
+# Hotkey backend: "keyboard" uses a global keyboard hook and lets the keys
+# through to other applications (Ctrl+V still pastes). "win32" registers the
+# hotkeys with Windows (RegisterHotKey), which is lighter but reserves the
+# combinations system-wide - only use it with hotkeys nothing else needs.
+HOTKEY_BACKEND = "keyboard"
+
 # Screenshot format
 SCREENSHOT_FORMAT = "png"
 
 # Screenshot quality (for JPEG, 1-100)
 SCREENSHOT_QUALITY = 95
 
+# PNG compression level (0-9). The saved file is embedded in the
+# presentation as-is (unless SLIDE_IMAGE_JPEG is on), so this also sets
+# the size of every .pptx and PDF. Level 6 is close to the smallest size
+# at a fraction of the encode time; saving runs off the hotkey path.
+SCREENSHOT_PNG_COMPRESS_LEVEL = 6
+
 # =============================================================================
 # PowerPoint Settings
 # =============================================================================
@@ -87,18 +129,87 @@ IMAGE_HEIGHT_INCHES = 5.0
 TEXT_BOX_WIDTH_INCHES = 6.0
 TEXT_BOX_HEIGHT_INCHES = 5.5
 
+# Save the presentation after this many new slides (None = only on close/export).
+# Each save rewrites the whole file, so saving after every slide gets slower
+# as the presentation grows.
+AUTOSAVE_INTERVAL = 10
+
+# Start a new presentation file (presentation_<time>_2.pptx, ...) after this
+# many captures (None = one file per session). Large presentations get slower
+# to extend and save.
+MAX_SLIDES_PER_FILE = 200
+
+# Re-encode large PNG screenshots as JPEG when adding them to slides
+# (smaller presentations, faster saves). Enable with SNAPLEARN_JPEG=1 in .env.
+SLIDE_IMAGE_JPEG = os.getenv("SNAPLEARN_JPEG", "0") == "1"
+
+# Only PNG files larger than this are re-encoded (bytes)
+SLIDE_IMAGE_JPEG_MIN_BYTES = 300 * 1024
+
+# JPEG quality for re-encoded slide images (1-100)
+SLIDE_IMAGE_JPEG_QUALITY = 85
+
+# Re-encoded images are downscaled to this resolution at their size on the slide
+SLIDE_IMAGE_DPI = 150
+
+# =============================================================================
+# Frozen Configuration
+# =============================================================================
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Immutable snapshot of the settings read on hot paths: the Gemini
+    service settings and every value taken from the environment.
+    
+    Built once at import time so environment variables are never
+    re-read on the hot path. The other modules import the plain
+    constants above.
+    """
+    gemini_api_key: str
+    gemini_model: str
+    gemini_timeout_ms: int
+    gemini_image_max_size: int
+    gemini_batch_window_seconds: float
+    gemini_batch_size: int
+    gemini_max_pending: int
+    gemini_max_in_flight: int
+    gemini_system_instruction: str
+    slide_image_jpeg: bool
+
+
+# Global configuration instance
+CFG = Config(
+    gemini_api_key=GEMINI_API_KEY,
+    gemini_model=GEMINI_MODEL,
+    gemini_timeout_ms=GEMINI_TIMEOUT_MS,
+    gemini_image_max_size=GEMINI_IMAGE_MAX_SIZE,
+    gemini_batch_window_seconds=GEMINI_BATCH_WINDOW_SECONDS,
+    gemini_batch_size=GEMINI_BATCH_SIZE,
+    gemini_max_pending=GEMINI_MAX_PENDING,
+    gemini_max_in_flight=GEMINI_MAX_IN_FLIGHT,
+    gemini_system_instruction=GEMINI_SYSTEM_INSTRUCTION,
+    slide_image_jpeg=SLIDE_IMAGE_JPEG
+)
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+# Set once the required directories have been created
+_DIRS_READY = False
+
+
+@functools.cache
 def validate_config() -> tuple[bool, str]:
     """
     Validates configuration settings.
+    The result is cached since the configuration is immutable.
     
     Returns:
         tuple: (is_valid, error_message)
     """
-    if not GEMINI_API_KEY:
+    if not CFG.gemini_api_key:
         return False, "GEMINI_API_KEY environment variable is not set. Please check your .env file."
     
     return True, ""
@@ -107,11 +218,13 @@ def validate_config() -> tuple[bool, str]:
 def ensure_directories():
     """
     Ensures required directories exist.
-    Creates them if they don't exist.
+    Creates them if they don't exist. Only the first successful call
+    touches the file system; later calls return immediately.
     """
+    global _DIRS_READY
+    if _DIRS_READY:
+        return
+    
     SCREENSHOTS_DIR.mkdir(parents=True, exist_ok=True)
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
-
-# Create directories when module is loaded
-ensure_directories()
+    _DIRS_READY = True
@@ -6,72 +6,239 @@ Uses asynchronous processing to prevent the application from freezing.
 """
 
 import asyncio
+import functools
+import io
 import logging
+import os
+import re
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 
+import httpx
 from google import genai
+from google.genai import types
 from PIL import Image
 
-from config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_SYSTEM_INSTRUCTION
+from config import CFG
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
-# Thread pool executor (for running sync API calls asynchronously)
-_executor = ThreadPoolExecutor(max_workers=2)
+# Number of concurrent API calls - one per batched request allowed in
+# flight (the I/O thread pool and the HTTP connection pool are sized
+# together so every worker reuses a kept-alive connection)
+_IO_WORKERS = CFG.gemini_max_in_flight
+
+# Thread pool for network-bound API calls
+_io_pool = ThreadPoolExecutor(max_workers=_IO_WORKERS, thread_name_prefix="gemini-io")
+
+# Thread pool for CPU-bound image preparation (decode + resize)
+_cpu_pool = ThreadPoolExecutor(
+    max_workers=max(1, (os.cpu_count() or 2) // 2),
+    thread_name_prefix="img-cpu"
+)
 
 # Global client instance
 _client = None
 
+# Response layout: "**Summary:** ... **Question:** ..." (markers optional bold,
+# question marker may read "Multiple Choice Question")
+_RESPONSE_RE = re.compile(
+    r"(?:\*\*)?summary:(?:\*\*)?\s*(.*?)\s*(?:\*\*)?(?:multiple choice )?question:(?:\*\*)?\s*(.*)",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Individual section markers (used when the response is not in the usual order)
+_SUMMARY_MARKER_RE = re.compile(r"(?:\*\*)?summary:(?:\*\*)?", re.IGNORECASE)
+_QUESTION_MARKER_RE = re.compile(
+    r"(?:\*\*)?(?:multiple choice )?question:(?:\*\*)?",
+    re.IGNORECASE
+)
+
+# Prompt for a single image (built once and reused for every request)
+_PROMPT_PART = types.Part.from_text(
+    text=f"""{CFG.gemini_system_instruction}
+
+Please analyze this educational content image:"""
+)
+
+# Leading/trailing whitespace and "*" left over from bold markers
+_EDGE_RE = re.compile(r"^[\s*]+|[\s*]+$")
+
+# Per-image delimiter in batched requests/responses ("---SLIDE 2---")
+_SLIDE_DELIMITER = "---SLIDE {}---"
+_SLIDE_SPLIT_RE = re.compile(r"-{3}\s*SLIDE\s*(\d+)\s*-{3}", re.IGNORECASE)
+
+# Pending (image, future) pairs waiting to be analyzed
+_batch_queue: asyncio.Queue | None = None
+
+# Consumer task draining the batch queue
+_batch_task: asyncio.Task | None = None
+
+# Limits the number of batches being analyzed at the same time
+_batch_gate: asyncio.Semaphore | None = None
+
 
 def _get_client():
     """
     Returns the Gemini API client.
+    The client keeps a persistent HTTP/2 connection pool.
     """
     global _client
     if _client is None:
-        if not GEMINI_API_KEY:
+        if not CFG.gemini_api_key:
             raise ValueError("GEMINI_API_KEY is not set!")
-        _client = genai.Client(api_key=GEMINI_API_KEY)
+        _client = genai.Client(
+            api_key=CFG.gemini_api_key,
+            http_options=types.HttpOptions(
+                timeout=CFG.gemini_timeout_ms,
+                client_args={
+                    "http2": True,
+                    "limits": httpx.Limits(
+                        max_keepalive_connections=_IO_WORKERS,
+                        max_connections=_IO_WORKERS
+                    )
+                }
+            )
+        )
         logger.info("Gemini API client created.")
     return _client
 
 
-def _analyze_image_sync(image_path: Path) -> dict:
+def warmup_client():
     """
-    Analyzes an image synchronously (for internal use).
+    Creates the API client and opens a connection with a cheap request,
+    so the first capture does not pay for DNS and the TLS handshake.
+    Errors are logged and ignored.
+    """
+    try:
+        client = _get_client()
+        client.models.list(config={"page_size": 1})
+        logger.info("Gemini API connection warmed up.")
+    except Exception as e:
+        logger.warning(f"Gemini API warmup failed: {e}")
+
+
+@functools.cache
+def _batch_prompt_part(count: int) -> types.Part:
+    """
+    Returns the prompt for a batched request (cached per image count).
     
     Args:
-        image_path: Path to the image file to analyze
+        count: Number of images in the request
         
     Returns:
-        dict: Analysis results (contains summary and question)
+        types.Part: Prompt text part
     """
-    try:
-        # Get client
-        client = _get_client()
+    return types.Part.from_text(
+        text=f"""{CFG.gemini_system_instruction}
+
+You will receive {count} educational content images. Analyze each image separately.
+Start the analysis of each image with its delimiter line exactly as given (for example {_SLIDE_DELIMITER.format(1)})."""
+    )
+
+
+def _prep_image(image: Path | Image.Image) -> types.Part:
+    """
+    Downscales an image and encodes it as an upload part (CPU-bound).
+    
+    In-memory captures are used as-is (no file decode) and are never
+    modified, since they may still be being saved to disk. The file on
+    disk stays full size.
+    
+    Args:
+        image: Path to the image file or an already captured image
         
-        logger.info(f"Loading image: {image_path}")
+    Returns:
+        types.Part: PNG part no larger than the configured maximum size
+    """
+    if isinstance(image, Image.Image):
+        logger.info(f"Preparing captured image: {image.size[0]}x{image.size[1]}")
+    else:
+        logger.info(f"Loading image: {image}")
+        image = Image.open(image)
+    
+    # Downscale the upload payload into a new image
+    max_size = CFG.gemini_image_max_size
+    scale = max_size / max(image.size)
+    if scale < 1:
+        new_size = (max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale)))
+        image = image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", compress_level=1)
+    
+    return types.Part.from_bytes(data=buffer.getvalue(), mime_type="image/png")
+
+
+def _error_result(error: Exception) -> dict:
+    """
+    Builds the result returned when an analysis fails.
+    
+    Args:
+        error: The exception that occurred
         
-        # Load image with PIL
-        image = Image.open(image_path)
+    Returns:
+        dict: Failed analysis result
+    """
+    return {
+        "summary": f"Error during image analysis: {str(error)}",
+        "question": "What do you see in this image?\nA) Option A\nB) Option B\nC) Option C\nD) Option D",
+        "raw_response": str(error),
+        "success": False
+    }
+
+
+def _stream_response(client, contents: list) -> str:
+    """
+    Streams a Gemini response and returns the full text.
+    
+    Args:
+        client: Gemini API client
+        contents: Request contents (prompt and images)
         
-        logger.info("Sending request to Gemini API...")
+    Returns:
+        str: Complete response text
         
-        # Create prompt
-        prompt = f"""{GEMINI_SYSTEM_INSTRUCTION}
+    Raises:
+        ValueError: If the response contained no text (e.g. it was blocked)
+    """
+    chunks = []
+    
+    for chunk in client.models.generate_content_stream(
+        model=CFG.gemini_model,
+        contents=contents
+    ):
+        if chunk.text:
+            chunks.append(chunk.text)
+    
+    response_text = "".join(chunks)
+    if not response_text.strip():
+        raise ValueError("Gemini API returned an empty response")
+    
+    return response_text
 
-Please analyze this educational content image:"""
+
+def _call_gemini_single(image: types.Part) -> dict:
+    """
+    Sends one prepared image to the Gemini API (network-bound).
+    
+    Args:
+        image: Prepared image part to analyze
         
-        # Analyze image - new API allows PIL Image directly
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=[prompt, image]
-        )
+    Returns:
+        dict: Analysis results (contains summary and question)
+    """
+    try:
+        # Get client
+        client = _get_client()
+        
+        logger.info("Sending request to Gemini API...")
         
-        # Get response
-        response_text = response.text
+        # Analyze image (streamed)
+        response_text = _stream_response(client, [_PROMPT_PART, image])
         logger.info("Gemini API response received.")
         
         # Parse response
@@ -81,12 +248,71 @@ Please analyze this educational content image:"""
         
     except Exception as e:
         logger.error(f"Gemini API error: {e}")
-        return {
-            "summary": f"Error during image analysis: {str(e)}",
-            "question": "What do you see in this image?\nA) Option A\nB) Option B\nC) Option C\nD) Option D",
-            "raw_response": str(e),
-            "success": False
-        }
+        return _error_result(e)
+
+
+def _call_gemini(images: list[types.Part]) -> list[dict]:
+    """
+    Sends prepared images to the Gemini API with a single request
+    (network-bound).
+    
+    Each image is labelled with a delimiter in the prompt and the model is
+    asked to repeat it, so the response can be split per image. Falls back
+    to one request per image if the response cannot be split.
+    
+    Args:
+        images: Prepared image parts to analyze
+        
+    Returns:
+        list[dict]: Analysis results, in the same order as images
+    """
+    if len(images) == 1:
+        return [_call_gemini_single(images[0])]
+    
+    try:
+        client = _get_client()
+        
+        contents = [_batch_prompt_part(len(images))]
+        for index, image in enumerate(images, start=1):
+            contents.append(_SLIDE_DELIMITER.format(index))
+            contents.append(image)
+        
+        logger.info(f"Sending batched request to Gemini API ({len(images)} images)...")
+        
+        response_text = _stream_response(client, contents)
+        logger.info("Gemini API batched response received.")
+        
+        # Split into per-image sections: [preamble, "1", text1, "2", text2, ...]
+        parts = _SLIDE_SPLIT_RE.split(response_text)
+        sections = {int(number): text for number, text in zip(parts[1::2], parts[2::2])}
+        
+        if sorted(sections) != list(range(1, len(images) + 1)):
+            raise ValueError("Batched response could not be split per image")
+        
+        return [_parse_response(sections[index]) for index in range(1, len(images) + 1)]
+        
+    except Exception as e:
+        logger.warning(f"Batched analysis failed ({e}), analyzing images one by one...")
+        return [_call_gemini_single(image) for image in images]
+
+
+def _analyze_image_sync(image: Path | Image.Image) -> dict:
+    """
+    Analyzes an image synchronously (for internal use).
+    
+    Args:
+        image: Path to the image file or captured image to analyze
+        
+    Returns:
+        dict: Analysis results (contains summary and question)
+    """
+    try:
+        part = _prep_image(image)
+    except Exception as e:
+        logger.error(f"Failed to load image: {e}")
+        return _error_result(e)
+    
+    return _call_gemini_single(part)
 
 
 def _parse_response(response_text: str) -> dict:
@@ -99,59 +325,35 @@ def _parse_response(response_text: str) -> dict:
     Returns:
         dict: Parsed results
     """
-    summary = ""
-    question = ""
-    
-    # Find **Summary:** and **Question:** sections
-    text_lower = response_text.lower()
-    
-    # Find Summary section
-    sum_markers = ["**summary:**", "summary:"]
-    quest_markers = ["**question:**", "**multiple choice question:**", "question:"]
-    
-    sum_start = -1
-    quest_start = -1
-    
-    for marker in sum_markers:
-        idx = text_lower.find(marker)
-        if idx != -1:
-            sum_start = idx + len(marker)
-            break
-    
-    for marker in quest_markers:
-        idx = text_lower.find(marker)
-        if idx != -1:
-            quest_start = idx + len(marker)
-            break
-    
-    # Split text into sections
-    if sum_start != -1 and quest_start != -1:
-        if sum_start < quest_start:
-            # Summary comes first
-            summary = response_text[sum_start:quest_start].strip()
-            # Clean question markers from summary
-            for marker in quest_markers:
-                summary = summary.replace(marker, "").replace(marker.upper(), "")
-            summary = summary.strip().rstrip("*").strip()
-            question = response_text[quest_start:].strip()
-        else:
-            # Question comes first
-            question = response_text[quest_start:sum_start].strip()
-            summary = response_text[sum_start:].strip()
-    elif sum_start != -1:
-        summary = response_text[sum_start:].strip()
-        question = "What is the main concept shown?\nA) Option A\nB) Option B\nC) Option C\nD) Option D"
-    elif quest_start != -1:
-        question = response_text[quest_start:].strip()
-        summary = response_text[:quest_start].strip()
+    # Fast path: summary followed by question, captured in one pass
+    match = _RESPONSE_RE.search(response_text)
+    
+    if match:
+        summary = match.group(1)
+        question = match.group(2)
     else:
-        # No markers found, use entire text as summary
-        summary = response_text.strip()
-        question = "What is the main idea in this image?\nA) Option A\nB) Option B\nC) Option C\nD) Option D"
+        # Fall back to locating the individual section markers
+        sum_match = _SUMMARY_MARKER_RE.search(response_text)
+        quest_match = _QUESTION_MARKER_RE.search(response_text)
+        
+        if sum_match and quest_match:
+            # Question comes first
+            question = response_text[quest_match.end():sum_match.start()]
+            summary = response_text[sum_match.end():]
+        elif sum_match:
+            summary = response_text[sum_match.end():]
+            question = "What is the main concept shown?\nA) Option A\nB) Option B\nC) Option C\nD) Option D"
+        elif quest_match:
+            question = response_text[quest_match.end():]
+            summary = response_text[:quest_match.start()]
+        else:
+            # No markers found, use entire text as summary
+            summary = response_text
+            question = "What is the main idea in this image?\nA) Option A\nB) Option B\nC) Option C\nD) Option D"
     
-    # Clean up
-    summary = summary.strip().strip("*").strip()
-    question = question.strip().strip("*").strip()
+    # Clean up surrounding whitespace and leftover bold markers
+    summary = _EDGE_RE.sub("", summary)
+    question = _EDGE_RE.sub("", question)
     
     # Remove "Correct Answer" from question display (keep it separate or at end)
     # Keep the full question with correct answer for educational purposes
@@ -164,15 +366,102 @@ def _parse_response(response_text: str) -> dict:
     }
 
 
-async def analyze_image_async(image_path: Path) -> dict:
+async def _process_batch(batch: list, previous: asyncio.Task | None):
+    """
+    Analyzes one batch of queued images and resolves their futures.
+    Releases the batch gate when done.
+    
+    Args:
+        batch: (image, future) pairs to analyze
+        previous: Task of the previous batch; its futures are resolved
+            first so results are delivered in capture order
+    """
+    loop = asyncio.get_running_loop()
+    
+    try:
+        # Prepare images on the CPU pool, then call the API on the I/O pool
+        prepared = await asyncio.gather(
+            *(loop.run_in_executor(_cpu_pool, _prep_image, image) for image, _ in batch),
+            return_exceptions=True
+        )
+        images = [image for image in prepared if not isinstance(image, BaseException)]
+        
+        try:
+            api_results = await loop.run_in_executor(_io_pool, _call_gemini, images) if images else []
+        except Exception as e:
+            logger.error(f"Batch analysis error: {e}")
+            api_results = [_error_result(e)] * len(images)
+        
+        # Failed image loads keep their error result in the batch order
+        api_iter = iter(api_results)
+        results = [
+            _error_result(image) if isinstance(image, BaseException) else next(api_iter)
+            for image in prepared
+        ]
+        
+        if previous is not None:
+            await asyncio.wait([previous])
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+                
+    finally:
+        _batch_gate.release()
+
+
+async def _batch_worker():
+    """
+    Drains the batch queue and analyzes pending images.
+    
+    After the first image arrives, waits a short window so that rapid
+    follow-up captures can join the same request. Batches run
+    concurrently, but each caller's future is resolved in capture order.
+    """
+    loop = asyncio.get_running_loop()
+    previous = None
+    
+    while True:
+        batch = [await _batch_queue.get()]
+        
+        # Backpressure: wait for a free slot before starting another batch
+        await _batch_gate.acquire()
+        
+        # Debounce: collect captures taken in quick succession
+        await asyncio.sleep(CFG.gemini_batch_window_seconds)
+        while len(batch) < CFG.gemini_batch_size and not _batch_queue.empty():
+            batch.append(_batch_queue.get_nowait())
+        
+        logger.info(f"Analyzing batch of {len(batch)} image(s), {_batch_queue.qsize()} still pending")
+        
+        previous = loop.create_task(_process_batch(batch, previous))
+
+
+def _ensure_batch_worker():
+    """
+    Creates the batch queue and gate and starts the consumer task on first use.
+    """
+    global _batch_queue, _batch_task, _batch_gate
+    
+    if _batch_queue is None:
+        _batch_queue = asyncio.Queue(maxsize=CFG.gemini_max_pending)
+        _batch_gate = asyncio.Semaphore(CFG.gemini_max_in_flight)
+    
+    if _batch_task is None or _batch_task.done():
+        _batch_task = asyncio.get_running_loop().create_task(_batch_worker())
+
+
+async def analyze_image_async(image: Path | Image.Image) -> dict:
     """
     Analyzes an image asynchronously.
     
-    This function runs the synchronous API call in a thread pool
-    to avoid blocking the main event loop.
+    The image is queued and analyzed in a thread pool to avoid blocking
+    the main event loop. Images queued within a short window are sent to
+    the API together in a single request. If too many captures are
+    already waiting, the image is rejected with a failed result.
     
     Args:
-        image_path: Path to the image file to analyze
+        image: Path to the image file or captured image to analyze
         
     Returns:
         dict: Analysis results
@@ -181,30 +470,33 @@ async def analyze_image_async(image_path: Path) -> dict:
             - raw_response: Raw API response
             - success: Whether the operation succeeded
     """
-    logger.info(f"Starting async image analysis: {image_path}")
+    logger.info("Starting async image analysis...")
     
-    # Run sync function asynchronously
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        _executor,
-        _analyze_image_sync,
-        image_path
-    )
+    _ensure_batch_worker()
+    
+    # The batch worker resolves this future with the analysis result
+    future = asyncio.get_running_loop().create_future()
+    
+    try:
+        _batch_queue.put_nowait((image, future))
+    except asyncio.QueueFull:
+        logger.warning(f"Analysis queue is full ({_batch_queue.qsize()} pending), capture rejected.")
+        return _error_result(RuntimeError("Too many captures waiting for analysis, please wait."))
     
-    return result
+    return await future
 
 
-def analyze_image(image_path: Path) -> dict:
+def analyze_image(image: Path | Image.Image) -> dict:
     """
     Analyzes an image synchronously (for simple usage).
     
     Args:
-        image_path: Path to the image file to analyze
+        image: Path to the image file or captured image to analyze
         
     Returns:
         dict: Analysis results
     """
-    return _analyze_image_sync(image_path)
+    return _analyze_image_sync(image)
 
 
 # =============================================================================
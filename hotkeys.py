@@ -0,0 +1,212 @@
+"""
+Hotkey Module
+=============
+This module registers global hotkeys, by default with the keyboard library.
+
+With HOTKEY_BACKEND = "win32" the Windows RegisterHotKey API is used instead.
+Windows then only notifies the application about the registered combinations,
+so unlike a low-level keyboard hook no Python code runs for other keystrokes,
+but the combinations are reserved for this application while it runs.
+Hotkeys that cannot be registered (another application owns them, or the
+platform is not Windows) fall back to the keyboard library.
+"""
+
+import ctypes
+import logging
+import sys
+import threading
+from ctypes import wintypes
+from typing import Callable
+
+from config import HOTKEY_BACKEND
+
+# Setup logger
+logger = logging.getLogger(__name__)
+
+# RegisterHotKey modifier flags
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+
+# Window messages
+WM_QUIT = 0x0012
+WM_HOTKEY = 0x0312
+
+# Modifier names accepted in hotkey strings
+_MODIFIERS = {
+    "ctrl": MOD_CONTROL,
+    "control": MOD_CONTROL,
+    "alt": MOD_ALT,
+    "shift": MOD_SHIFT,
+    "win": MOD_WIN,
+    "windows": MOD_WIN
+}
+
+# Virtual-key codes for named keys (letters and digits map to their ASCII code)
+_NAMED_KEYS = {
+    "space": 0x20,
+    "enter": 0x0D,
+    "tab": 0x09,
+    "esc": 0x1B,
+    "escape": 0x1B,
+    "insert": 0x2D,
+    "delete": 0x2E,
+    "home": 0x24,
+    "end": 0x23,
+    **{f"f{number}": 0x70 + number - 1 for number in range(1, 13)}
+}
+
+
+def parse_hotkey(hotkey: str) -> tuple[int, int]:
+    """
+    Converts a hotkey string such as "ctrl+v" to RegisterHotKey arguments.
+    
+    Args:
+        hotkey: Key combination, modifiers and one key joined by "+"
+    
+    Returns:
+        tuple: (modifier_flags, virtual_key_code)
+    
+    Raises:
+        ValueError: If the hotkey string cannot be converted
+    """
+    modifiers = 0
+    key = None
+    
+    for part in hotkey.lower().split("+"):
+        part = part.strip()
+        if part in _MODIFIERS:
+            modifiers |= _MODIFIERS[part]
+        elif key is None:
+            key = part
+        else:
+            raise ValueError(f"Hotkey has more than one key: {hotkey}")
+    
+    if key is None:
+        raise ValueError(f"Hotkey has no key: {hotkey}")
+    
+    if len(key) == 1 and key.isalnum() and key.isascii():
+        return modifiers, ord(key.upper())
+    if key in _NAMED_KEYS:
+        return modifiers, _NAMED_KEYS[key]
+    
+    raise ValueError(f"Unsupported hotkey key: {key}")
+
+
+class HotkeyListener:
+    """
+    Global hotkey listener.
+    
+    Runs a Win32 message loop on a dedicated thread and calls the
+    registered callbacks on that thread when WM_HOTKEY arrives.
+    """
+    
+    def __init__(self):
+        """
+        Creates a new HotkeyListener instance.
+        Hotkeys are registered when start() is called.
+        """
+        self._hotkeys: list[tuple[str, Callable[[], None]]] = []
+        self._thread = None
+        self._thread_id = None
+        self._ready = threading.Event()
+        self._failed: list[tuple[str, Callable[[], None]]] = []
+        self._uses_keyboard = False
+    
+    def add_hotkey(self, hotkey: str, callback: Callable[[], None]):
+        """
+        Adds a hotkey to register on start().
+        
+        Args:
+            hotkey: Key combination (e.g. "ctrl+v")
+            callback: Function called when the hotkey is pressed
+        """
+        self._hotkeys.append((hotkey, callback))
+    
+    def start(self):
+        """
+        Registers all hotkeys.
+        Uses RegisterHotKey when the win32 backend is selected (Windows
+        only) and the keyboard library for everything else.
+        """
+        if sys.platform == "win32" and HOTKEY_BACKEND == "win32":
+            self._thread = threading.Thread(
+                target=self._run,
+                name="hotkeys",
+                daemon=True
+            )
+            self._thread.start()
+            self._ready.wait()
+        else:
+            self._failed = list(self._hotkeys)
+        
+        if self._failed:
+            import keyboard
+            
+            for hotkey, callback in self._failed:
+                keyboard.add_hotkey(hotkey, callback)
+                logger.info(f"Hotkey {hotkey.upper()} registered with the keyboard library.")
+            self._uses_keyboard = True
+    
+    def stop(self):
+        """
+        Unregisters all hotkeys and stops the message loop thread.
+        """
+        if self._thread is not None and self._thread_id is not None:
+            ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+            self._thread.join(timeout=2)
+            self._thread = None
+        
+        if self._uses_keyboard:
+            import keyboard
+            
+            keyboard.unhook_all()
+            self._uses_keyboard = False
+    
+    def _run(self):
+        """
+        Registers the hotkeys and runs the message loop (hotkey thread).
+        RegisterHotKey binds the hotkeys to the calling thread, so both
+        must happen on the same thread.
+        """
+        user32 = ctypes.windll.user32
+        registered = []
+        
+        try:
+            self._thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+            
+            for hotkey_id, (hotkey, _) in enumerate(self._hotkeys, start=1):
+                try:
+                    modifiers, vk = parse_hotkey(hotkey)
+                except ValueError as e:
+                    logger.warning(f"{e} - using the keyboard library instead.")
+                    continue
+                
+                if user32.RegisterHotKey(None, hotkey_id, modifiers | MOD_NOREPEAT, vk):
+                    registered.append(hotkey_id)
+                    logger.info(f"Hotkey {hotkey.upper()} registered.")
+                else:
+                    logger.warning(f"Could not register {hotkey.upper()} (in use by another application?)")
+        
+        finally:
+            # Anything not registered here is picked up by the fallback in start()
+            ids = set(registered)
+            self._failed = [
+                entry for hotkey_id, entry in enumerate(self._hotkeys, start=1)
+                if hotkey_id not in ids
+            ]
+            self._ready.set()
+        
+        msg = wintypes.MSG()
+        while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+            if msg.message == WM_HOTKEY:
+                _, callback = self._hotkeys[msg.wParam - 1]
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Hotkey callback error: {e}")
+        
+        for hotkey_id in registered:
+            user32.UnregisterHotKey(None, hotkey_id)
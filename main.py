@@ -11,7 +11,7 @@ Usage:
        - Capture the screen
        - Analyze it with Gemini AI
        - Create a PowerPoint slide
-    5. Press Ctrl+C to close the application
+    5. Press Ctrl+Alt+Q (or Ctrl+C in the console) to close the application
 
 Requirements:
     - Python 3.10+
@@ -22,18 +22,26 @@ Author: AI Assistant
 Date: 2024
 """
 
+import array
 import asyncio
+import collections
 import logging
+import math
+import signal
+import socket
 import sys
-import winsound
+import tempfile
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-import keyboard
-
-from config import HOTKEY, HOTKEY_DIRECT, validate_config
+from config import HOTKEY, HOTKEY_DIRECT, HOTKEY_QUIT, ensure_directories, validate_config
+from hotkeys import HotkeyListener
 from screen_capture import capture_screen
-from gemini_service import analyze_image_async
-from slide_generator import add_slide, add_slide_direct, get_current_filepath, export_to_pdf
+
+# gemini_service (google-genai) and slide_generator (python-pptx) are heavy
+# to import; they are loaded by a background thread at startup - see _prewarm()
 
 # =============================================================================
 # Logging Configuration
@@ -54,41 +62,161 @@ logger = logging.getLogger(__name__)
 # Global Variables
 # =============================================================================
 
-# Prevent new triggers while processing
-_processing = False
-
 # Event loop reference
 _loop: asyncio.AbstractEventLoop = None
 
+# Set when the application should shut down
+_stop_event: asyncio.Event = None
+
+# Hotkey event types
+_EVENT_AI = "ai"
+_EVENT_DIRECT = "direct"
+
+# Hotkey presses waiting to be dispatched (filled by the hotkey thread)
+_hotkey_events: collections.deque = collections.deque(maxlen=8)
+
+# Set when new hotkey events are queued
+_hotkey_wake: asyncio.Event = None
+
+# Running capture tasks
+_capture_tasks: set[asyncio.Task] = set()
+
+# Lazily imported modules (set by _prewarm)
+_gemini = None
+_slides = None
+
+# Set once the background import of the heavy modules has finished
+_modules_ready = threading.Event()
+
+# Adds slides off the event loop, so an autosave holding the presentation
+# lock cannot stall hotkey dispatch (one worker keeps slides in order)
+_slide_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slides")
+
 
 # =============================================================================
 # Sound Notifications
 # =============================================================================
 
-def play_capture_sound():
-    """Screen capture sound notification."""
+# Sample rate of the generated notification tones
+_SOUND_SAMPLE_RATE = 22050
+
+def _build_sound(name: str, tones: list[tuple[int, int]]) -> str | None:
+    """
+    Generates a WAV file from a sequence of sine tones.
+    
+    Args:
+        name: File name (without extension)
+        tones: (frequency_hz, duration_ms) pairs played back to back
+        
+    Returns:
+        str | None: Path of the generated WAV file or None on error
+    """
+    try:
+        samples = array.array("h")
+        for frequency, duration_ms in tones:
+            count = _SOUND_SAMPLE_RATE * duration_ms // 1000
+            step = 2 * math.pi * frequency / _SOUND_SAMPLE_RATE
+            samples.extend(int(12000 * math.sin(step * i)) for i in range(count))
+        
+        filepath = Path(tempfile.gettempdir()) / f"snaplearn_{name}.wav"
+        with open(filepath, "wb") as file, wave.open(file, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(_SOUND_SAMPLE_RATE)
+            wav.writeframes(samples.tobytes())
+        
+        return str(filepath)
+        
+    except Exception as e:
+        logger.warning(f"Could not create notification sound '{name}': {e}")
+        return None
+
+
+# Preloaded notification sounds (same tones as the previous Beep sequences).
+# Sounds are only played on Windows, so the files are not created elsewhere.
+if sys.platform == "win32":
+    _WAV_CAPTURE = _build_sound("capture", [(800, 150)])
+    _WAV_OK = _build_sound("success", [(600, 100), (800, 100), (1000, 150)])
+    _WAV_ERR = _build_sound("error", [(300, 300)])
+else:
+    _WAV_CAPTURE = _WAV_OK = _WAV_ERR = None
+
+
+def _play_sound(filepath: str | None):
+    """
+    Plays a WAV file asynchronously so the caller never waits for the tone.
+    (winsound cannot play in-memory sounds asynchronously, so the tones are
+    written to small WAV files once at startup.)
+    """
+    if filepath is None:
+        return
     try:
-        winsound.Beep(800, 150)  # High short beep
+        import winsound
+        winsound.PlaySound(
+            filepath,
+            winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT
+        )
     except Exception:
         pass
 
 
+def play_capture_sound():
+    """Screen capture sound notification."""
+    _play_sound(_WAV_CAPTURE)  # High short beep
+
+
 def play_success_sound():
     """Operation successful sound notification."""
-    try:
-        winsound.Beep(600, 100)
-        winsound.Beep(800, 100)
-        winsound.Beep(1000, 150)
-    except Exception:
-        pass
+    _play_sound(_WAV_OK)
 
 
 def play_error_sound():
     """Error sound notification."""
+    _play_sound(_WAV_ERR)
+
+
+# =============================================================================
+# Background Module Loading
+# =============================================================================
+
+def _prewarm():
+    """
+    Imports the heavy modules and warms up the Gemini connection
+    (runs on a background thread at startup).
+    """
+    global _gemini, _slides
+    
     try:
-        winsound.Beep(300, 300)
-    except Exception:
-        pass
+        import gemini_service
+        import slide_generator
+        
+        _gemini = gemini_service
+        _slides = slide_generator
+        
+        logger.info(f"Presentation file: {_slides.get_current_filepath()}")
+        
+    except Exception as e:
+        logger.error(f"Failed to load modules: {e}")
+        
+    finally:
+        _modules_ready.set()
+    
+    if _gemini is not None:
+        _gemini.warmup_client()
+
+
+async def wait_for_modules() -> bool:
+    """
+    Waits until the background import has finished.
+    
+    Returns:
+        bool: True if the modules are available
+    """
+    if not _modules_ready.is_set():
+        logger.info("Waiting for modules to finish loading...")
+        await asyncio.get_running_loop().run_in_executor(None, _modules_ready.wait)
+    
+    return _gemini is not None and _slides is not None
 
 
 # =============================================================================
@@ -101,15 +229,10 @@ async def process_capture():
     1. Capture screenshot
     2. Analyze with Gemini
     3. Create PowerPoint slide
-    """
-    global _processing
-    
-    if _processing:
-        logger.warning("Previous operation still in progress, please wait...")
-        return
-    
-    _processing = True
     
+    Captures taken in quick succession are not dropped: their analyses
+    are batched by the Gemini service and slides are added in order.
+    """
     try:
         logger.info("=" * 50)
         logger.info("New capture started...")
@@ -118,19 +241,31 @@ async def process_capture():
         logger.info("Capturing screenshot...")
         play_capture_sound()
         
-        image_path = capture_screen()
+        capture = capture_screen()
         
-        if not image_path or not image_path.exists():
+        if not capture:
             logger.error("Failed to capture screenshot!")
             play_error_sound()
             return
         
-        logger.info(f"Screenshot saved: {image_path.name}")
+        image_path, image, save_future = capture
         
-        # 2. Analyze with Gemini
+        # 2. Analyze with Gemini (the in-memory capture is uploaded while
+        # the screenshot is still being written to disk)
         logger.info("Analyzing with Gemini AI...")
         
-        result = await analyze_image_async(image_path)
+        if not await wait_for_modules():
+            play_error_sound()
+            return
+        
+        result = await _gemini.analyze_image_async(image)
+        
+        if not await asyncio.wrap_future(save_future):
+            logger.error("Failed to save screenshot!")
+            play_error_sound()
+            return
+        
+        logger.info(f"Screenshot saved: {image_path.name}")
         
         if not result.get("success", False):
             logger.error(f"Gemini analysis failed: {result.get('summary', 'Unknown error')}")
@@ -146,10 +281,12 @@ async def process_capture():
         # 3. Create PowerPoint slide
         logger.info("Creating PowerPoint slide...")
         
-        slide_num = add_slide(image_path, summary, question)
+        slide_num = await asyncio.get_running_loop().run_in_executor(
+            _slide_pool, _slides.add_slide, image_path, summary, question
+        )
         
         logger.info(f"Slide #{slide_num} added successfully!")
-        logger.info(f"   Presentation file: {get_current_filepath()}")
+        logger.info(f"   Presentation file: {_slides.get_current_filepath()}")
         
         play_success_sound()
         
@@ -158,37 +295,58 @@ async def process_capture():
     except Exception as e:
         logger.error(f"Processing error: {e}")
         play_error_sound()
-        
-    finally:
-        _processing = False
 
 
-def on_hotkey_pressed():
-    """
-    Called when the AI analysis hotkey (Ctrl+V) is pressed.
-    Adds the async task to the event loop.
+def _queue_hotkey_event(kind: str):
     """
-    global _loop
+    Records a hotkey press and wakes the dispatcher (runs on the
+    hotkey thread, so it only appends and returns).
     
+    Args:
+        kind: Hotkey event type (_EVENT_AI or _EVENT_DIRECT)
+    """
     if _loop is not None and _loop.is_running():
-        # Add async task to event loop
-        asyncio.run_coroutine_threadsafe(process_capture(), _loop)
+        _hotkey_events.append(kind)
+        # Wake the loop once per burst; the dispatcher drains every queued event
+        if not _hotkey_wake.is_set():
+            _loop.call_soon_threadsafe(_hotkey_wake.set)
     else:
         logger.error("Event loop is not running!")
 
 
+def on_hotkey_pressed():
+    """
+    Called when the AI analysis hotkey (Ctrl+V) is pressed.
+    Queues the event for the dispatcher on the event loop.
+    """
+    _queue_hotkey_event(_EVENT_AI)
+
+
 def on_direct_hotkey_pressed():
     """
     Called when the direct capture hotkey (Ctrl+B) is pressed.
     Captures screen and adds to presentation without AI analysis.
     """
-    global _loop
-    
-    if _loop is not None and _loop.is_running():
-        # Add async task to event loop
-        asyncio.run_coroutine_threadsafe(process_direct_capture(), _loop)
-    else:
-        logger.error("Event loop is not running!")
+    _queue_hotkey_event(_EVENT_DIRECT)
+
+
+async def dispatch_hotkey_events():
+    """
+    Drains queued hotkey events and starts a capture task for each,
+    in the order the hotkeys were pressed.
+    """
+    while True:
+        await _hotkey_wake.wait()
+        _hotkey_wake.clear()
+        
+        while _hotkey_events:
+            kind = _hotkey_events.popleft()
+            handler = process_capture if kind == _EVENT_AI else process_direct_capture
+            
+            # Keep a reference so the task is not garbage collected mid-run
+            task = _loop.create_task(handler())
+            _capture_tasks.add(task)
+            task.add_done_callback(_capture_tasks.discard)
 
 
 async def process_direct_capture():
@@ -197,14 +355,6 @@ async def process_direct_capture():
     1. Capture screenshot
     2. Add directly to PowerPoint
     """
-    global _processing
-    
-    if _processing:
-        logger.warning("Previous operation still in progress, please wait...")
-        return
-    
-    _processing = True
-    
     try:
         logger.info("=" * 50)
         logger.info("Direct capture started...")
@@ -213,22 +363,35 @@ async def process_direct_capture():
         logger.info("Capturing screenshot...")
         play_capture_sound()
         
-        image_path = capture_screen()
+        capture = capture_screen()
         
-        if not image_path or not image_path.exists():
+        if not capture:
             logger.error("Failed to capture screenshot!")
             play_error_sound()
             return
         
+        image_path, _, save_future = capture
+        
+        if not await asyncio.wrap_future(save_future):
+            logger.error("Failed to save screenshot!")
+            play_error_sound()
+            return
+        
         logger.info(f"Screenshot saved: {image_path.name}")
         
+        if not await wait_for_modules():
+            play_error_sound()
+            return
+        
         # 2. Add directly to PowerPoint (no AI)
         logger.info("Adding directly to PowerPoint (no AI analysis)...")
         
-        slide_num = add_slide_direct(image_path)
+        slide_num = await asyncio.get_running_loop().run_in_executor(
+            _slide_pool, _slides.add_slide_direct, image_path
+        )
         
         logger.info(f"Slide #{slide_num} added successfully (direct capture)!")
-        logger.info(f"   Presentation file: {get_current_filepath()}")
+        logger.info(f"   Presentation file: {_slides.get_current_filepath()}")
         
         play_success_sound()
         
@@ -237,9 +400,6 @@ async def process_direct_capture():
     except Exception as e:
         logger.error(f"Processing error: {e}")
         play_error_sound()
-        
-    finally:
-        _processing = False
 
 
 # =============================================================================
@@ -259,22 +419,63 @@ def print_banner():
 |                                                               |
 |   Ctrl+V  : Capture with AI analysis (summary + question)     |
 |   Ctrl+B  : Direct capture (screenshot only, no AI)           |
-|   Ctrl+C  : Close the application                             |
+|   Ctrl+Alt+Q : Close the application (Ctrl+C in this window)  |
 |                                                               |
 +===============================================================+
 """
     print(banner)
 
 
+def request_stop():
+    """
+    Asks the main loop to shut down.
+    Safe to call from any thread (hotkey and signal handlers).
+    """
+    if _loop is not None and _stop_event is not None:
+        _loop.call_soon_threadsafe(_stop_event.set)
+
+
+def install_stop_handlers() -> tuple[socket.socket, socket.socket] | None:
+    """
+    Routes Ctrl+C (SIGINT) to request_stop().
+    
+    Where the event loop cannot handle signals itself (Windows), a
+    Python signal handler is used together with a wakeup socket, so the
+    idle event loop is woken up as soon as the signal arrives.
+    
+    Returns:
+        tuple | None: (reader, writer) wakeup sockets to close on exit, if
+            they were created
+    """
+    try:
+        _loop.add_signal_handler(signal.SIGINT, _stop_event.set)
+        return None
+    except NotImplementedError:
+        pass
+    
+    wakeup_reader, wakeup_writer = socket.socketpair()
+    wakeup_reader.setblocking(False)
+    wakeup_writer.setblocking(False)
+    _loop.add_reader(wakeup_reader, wakeup_reader.recv, 64)
+    
+    signal.set_wakeup_fd(wakeup_writer.fileno())
+    signal.signal(signal.SIGINT, lambda *_: request_stop())
+    
+    return wakeup_reader, wakeup_writer
+
+
 async def main():
     """
     Main application loop.
     """
-    global _loop
+    global _loop, _stop_event, _hotkey_wake
     
     # Print banner
     print_banner()
     
+    # Load heavy modules and warm up the Gemini connection in the background
+    threading.Thread(target=_prewarm, name="prewarm", daemon=True).start()
+    
     # Validate configuration
     logger.info("Checking configuration...")
     is_valid, error_msg = validate_config()
@@ -287,55 +488,82 @@ async def main():
     
     logger.info("Configuration valid.")
     
+    # Create output folders once at startup
+    ensure_directories()
+    
     # Store event loop reference
     _loop = asyncio.get_event_loop()
+    _stop_event = asyncio.Event()
+    wakeup_sockets = install_stop_handlers()
     
-    # Register hotkeys
-    logger.info(f"Registering hotkeys: {HOTKEY.upper()} (AI), {HOTKEY_DIRECT.upper()} (Direct)")
-    keyboard.add_hotkey(HOTKEY, on_hotkey_pressed)
-    keyboard.add_hotkey(HOTKEY_DIRECT, on_direct_hotkey_pressed)
-    logger.info(f"{HOTKEY.upper()} and {HOTKEY_DIRECT.upper()} hotkeys active!")
+    # Start the hotkey dispatcher
+    _hotkey_wake = asyncio.Event()
+    dispatcher = _loop.create_task(dispatch_hotkey_events())
     
-    # Presentation file info
-    logger.info(f"Presentation file: {get_current_filepath()}")
+    # Register hotkeys
+    logger.info(f"Registering hotkeys: {HOTKEY.upper()} (AI), {HOTKEY_DIRECT.upper()} (Direct), {HOTKEY_QUIT.upper()} (Quit)")
+    hotkey_listener = HotkeyListener()
+    hotkey_listener.add_hotkey(HOTKEY, on_hotkey_pressed)
+    hotkey_listener.add_hotkey(HOTKEY_DIRECT, on_direct_hotkey_pressed)
+    hotkey_listener.add_hotkey(HOTKEY_QUIT, request_stop)
+    hotkey_listener.start()
+    logger.info(f"{HOTKEY.upper()}, {HOTKEY_DIRECT.upper()} and {HOTKEY_QUIT.upper()} hotkeys active!")
     
     print("\n" + "=" * 60)
     print("Application ready!")
     print("  Ctrl+V = Capture with AI analysis")
     print("  Ctrl+B = Direct capture (no AI)")
+    print("  Ctrl+Alt+Q = Close the application")
     print("=" * 60 + "\n")
     
     # Startup sound
     play_success_sound()
     
     try:
-        # Infinite loop - keep application running
-        while True:
-            await asyncio.sleep(0.1)
+        # Keep application running until a stop is requested
+        await _stop_event.wait()
+        logger.info("\nClosing application...")
             
     except KeyboardInterrupt:
         logger.info("\nClosing application...")
         
     finally:
         # Remove hotkeys
-        keyboard.unhook_all()
+        hotkey_listener.stop()
+        dispatcher.cancel()
         logger.info("Hotkeys removed.")
         
-        # Export to PDF
-        print("\nExporting presentation to PDF...")
-        logger.info("Exporting presentation to PDF...")
-        pdf_path = export_to_pdf()
-        
-        if pdf_path:
-            logger.info(f"PDF exported: {pdf_path}")
-            print(f"PDF saved: {pdf_path}")
-        else:
-            logger.warning("PDF export failed or skipped.")
-            print("PDF export failed (PowerPoint may not be installed).")
-        
-        # Final info
-        logger.info(f"Created presentation: {get_current_filepath()}")
-        print(f"\nPresentation saved: {get_current_filepath()}")
+        if wakeup_sockets is not None:
+            wakeup_reader, wakeup_writer = wakeup_sockets
+            signal.set_wakeup_fd(-1)
+            _loop.remove_reader(wakeup_reader)
+            wakeup_reader.close()
+            wakeup_writer.close()
+        
+        # Export to PDF (the background import may still be running, and
+        # a slide may still be being added)
+        _modules_ready.wait()
+        _slide_pool.shutdown(wait=True)
+        
+        if _slides is not None:
+            print("\nExporting presentation to PDF...")
+            logger.info("Exporting presentation to PDF...")
+            pptx_paths = _slides.get_session_filepaths()
+            pdf_paths = _slides.export_session_to_pdf()
+            
+            for pdf_path in pdf_paths:
+                logger.info(f"PDF exported: {pdf_path}")
+                print(f"PDF saved: {pdf_path}")
+            if len(pdf_paths) < len(pptx_paths):
+                logger.warning("PDF export failed or skipped.")
+                print("PDF export failed (LibreOffice or PowerPoint may not be installed).")
+            
+            # Final info (long sessions are split into several files)
+            print()
+            for pptx_path in pptx_paths:
+                logger.info(f"Created presentation: {pptx_path}")
+                print(f"Presentation saved: {pptx_path}")
+        
         print("Application closed successfully. Goodbye!")
 
 
@@ -0,0 +1,18 @@
+# Exports a PowerPoint presentation to PDF using PowerPoint COM automation.
+# Usage: powershell -NoProfile -ExecutionPolicy Bypass -File export_pdf.ps1 -Pptx <file.pptx> -Pdf <file.pdf>
+param(
+    [Parameter(Mandatory = $true)][string]$Pptx,
+    [Parameter(Mandatory = $true)][string]$Pdf
+)
+
+$ErrorActionPreference = "Stop"
+
+$powerpoint = New-Object -ComObject PowerPoint.Application
+try {
+    $presentation = $powerpoint.Presentations.Open($Pptx, [Microsoft.Office.Core.MsoTriState]::msoTrue, [Microsoft.Office.Core.MsoTriState]::msoFalse, [Microsoft.Office.Core.MsoTriState]::msoFalse)
+    $presentation.SaveAs($Pdf, 32)
+    $presentation.Close()
+}
+finally {
+    $powerpoint.Quit()
+}
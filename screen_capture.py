@@ -1,62 +1,162 @@
 """
 Screen Capture Module
 =====================
-This module handles screen capture operations using the Pillow (PIL) library.
-Captured images are saved to the screenshots folder with timestamps.
+This module handles screen capture operations using the mss library.
+Captured frames are encoded with Pillow (PIL) and saved to the screenshots
+folder with timestamps.
 """
 
+import itertools
 import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from PIL import ImageGrab
 
-from config import SCREENSHOTS_DIR, SCREENSHOT_FORMAT, SCREENSHOT_QUALITY
+import mss
+from PIL import Image
+
+from config import (
+    SCREENSHOTS_DIR,
+    SCREENSHOT_FORMAT,
+    SCREENSHOT_QUALITY,
+    SCREENSHOT_PNG_COMPRESS_LEVEL,
+    ensure_directories
+)
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# Per-thread mss instances (the underlying device context is bound to the
+# thread that created it, so it is reused but never shared across threads)
+_local = threading.local()
+
+# Background writer for captured frames (single worker keeps saves in order)
+_write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture-io")
+
+# Cached primary monitor size
+_screen_size: tuple[int, int] | None = None
+
+# Capture sequence number (keeps filenames unique within one millisecond)
+_capture_counter = itertools.count(1)
 
-def capture_screen() -> Path | None:
+
+def _get_sct() -> mss.base.MSSBase:
+    """
+    Returns the mss capture instance for the current thread.
+    Creates it on first use.
     """
-    Captures a full screenshot of the current screen and saves it to a file.
+    sct = getattr(_local, "sct", None)
+    if sct is None:
+        sct = mss.mss()
+        _local.sct = sct
+    return sct
+
+
+def _unique_timestamp() -> str:
+    """
+    Returns a timestamp for screenshot filenames that is unique per capture.
+    Rapid captures can fall into the same second (or millisecond), so the
+    milliseconds and a sequence number are included.
+    Example: 2024-01-15_14-30-45-123_0001
+    """
+    now = datetime.now()
+    sequence = next(_capture_counter)
+    return f"{now:%Y-%m-%d_%H-%M-%S}-{now.microsecond // 1000:03d}_{sequence:04d}"
+
+
+def _grab(region) -> Image.Image:
+    """
+    Grabs a screen region with mss and wraps it in a PIL Image.
     
-    The image is saved with a unique timestamp-based filename.
-    Example: screenshot_2024-01-15_14-30-45.png
+    Args:
+        region: mss monitor dict or (left, top, right, bottom) tuple
+        
+    Returns:
+        Image.Image: Captured RGB image
+    """
+    shot = _get_sct().grab(region)
+    # Unpack mss's native BGRA buffer (shot.raw) directly. shot.rgb and
+    # shot.bgra would both build a full-frame copy first. The BGRX -> RGB
+    # unpack writes into new image memory, so the frame stays valid after
+    # the next grab.
+    return Image.frombuffer("RGB", shot.size, shot.raw, "raw", "BGRX", 0, 1)
+
+
+def _save_image(image: Image.Image, filepath: Path) -> bool:
+    """
+    Encodes an image and writes it to disk (runs on the write pool).
     
+    Args:
+        image: Image to save
+        filepath: Destination file path
+        
     Returns:
-        Path | None: File path of the saved image or None on error
+        bool: True if the file was written
+    """
+    try:
+        # Encoder settings from config (the PNG is also what the slide embeds)
+        if SCREENSHOT_FORMAT.lower() == "png":
+            image.save(
+                filepath,
+                format="PNG",
+                optimize=False,
+                compress_level=SCREENSHOT_PNG_COMPRESS_LEVEL
+            )
+        elif SCREENSHOT_FORMAT.lower() in ("jpg", "jpeg"):
+            image.save(
+                filepath, 
+                format="JPEG", 
+                quality=SCREENSHOT_QUALITY, 
+                subsampling=2
+            )
+        else:
+            image.save(filepath)
+        
+        logger.info(f"Screenshot saved: {filepath}")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Failed to save screenshot: {e}")
+        return False
+
+
+def capture_screen() -> tuple[Path, Image.Image, Future] | None:
+    """
+    Captures a full screenshot of the current screen.
+    
+    The frame is returned in memory right away so it can be analyzed
+    without a disk round trip, while it is encoded and saved in the
+    background with a unique timestamp-based filename.
+    Example: screenshot_2024-01-15_14-30-45-123_0001.png
+    
+    Returns:
+        tuple | None: (file path, captured image, save future) or None on
+            error. The future resolves to True once the file is on disk.
     
     Raises:
         Any exception is caught and logged.
     """
     try:
+        ensure_directories()
+        
         # Create unique filename with timestamp
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        timestamp = _unique_timestamp()
         filename = f"screenshot_{timestamp}.{SCREENSHOT_FORMAT}"
         filepath = SCREENSHOTS_DIR / filename
         
         logger.info(f"Capturing screenshot: {filename}")
         
-        # Capture screenshot (entire screen)
-        screenshot = ImageGrab.grab(all_screens=False)
+        # Capture screenshot (primary monitor)
+        screenshot = _grab(_get_sct().monitors[1])
         
-        # Save image
-        if SCREENSHOT_FORMAT.lower() == "png":
-            screenshot.save(filepath, format="PNG", optimize=True)
-        elif SCREENSHOT_FORMAT.lower() in ("jpg", "jpeg"):
-            screenshot.save(
-                filepath, 
-                format="JPEG", 
-                quality=SCREENSHOT_QUALITY, 
-                optimize=True
-            )
-        else:
-            screenshot.save(filepath)
-        
-        logger.info(f"Screenshot saved: {filepath}")
         logger.info(f"Image size: {screenshot.size[0]}x{screenshot.size[1]} pixels")
         
-        return filepath
+        # Save image in the background
+        save_future = _write_pool.submit(_save_image, screenshot, filepath)
+        
+        return filepath, screenshot, save_future
         
     except Exception as e:
         logger.error(f"Failed to capture screenshot: {e}")
@@ -74,14 +174,16 @@ def capture_region(bbox: tuple[int, int, int, int]) -> Path | None:
         Path | None: File path of the saved image or None on error
     """
     try:
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        ensure_directories()
+        
+        timestamp = _unique_timestamp()
         filename = f"screenshot_region_{timestamp}.{SCREENSHOT_FORMAT}"
         filepath = SCREENSHOTS_DIR / filename
         
         logger.info(f"Capturing region: {bbox}")
         
         # Capture the specified region
-        screenshot = ImageGrab.grab(bbox=bbox)
+        screenshot = _grab(bbox)
         screenshot.save(filepath, format=SCREENSHOT_FORMAT.upper())
         
         logger.info(f"Region screenshot saved: {filepath}")
@@ -96,15 +198,19 @@ def capture_region(bbox: tuple[int, int, int, int]) -> Path | None:
 def get_screen_size() -> tuple[int, int]:
     """
     Returns the screen dimensions.
+    The value is read from the primary monitor once and then cached.
     
     Returns:
         tuple: (width, height) in pixels
     """
+    global _screen_size
+    if _screen_size is not None:
+        return _screen_size
+    
     try:
-        screenshot = ImageGrab.grab()
-        size = screenshot.size
-        screenshot.close()
-        return size
+        monitor = _get_sct().monitors[1]
+        _screen_size = (monitor["width"], monitor["height"])
+        return _screen_size
     except Exception as e:
         logger.error(f"Failed to get screen size: {e}")
         return (1920, 1080)  # Default value
@@ -125,14 +231,21 @@ def cleanup_old_screenshots(max_age_days: int = 7) -> int:
     deleted_count = 0
     current_time = time.time()
     max_age_seconds = max_age_days * 24 * 60 * 60
+    suffix = f".{SCREENSHOT_FORMAT}"
     
     try:
-        for filepath in SCREENSHOTS_DIR.glob(f"*.{SCREENSHOT_FORMAT}"):
-            file_age = current_time - filepath.stat().st_mtime
-            if file_age > max_age_seconds:
-                filepath.unlink()
-                deleted_count += 1
-                logger.info(f"Deleted old file: {filepath}")
+        ensure_directories()
+        
+        # scandir entries carry cached stat data from the directory read
+        with os.scandir(SCREENSHOTS_DIR) as entries:
+            for entry in entries:
+                if not entry.name.endswith(suffix) or not entry.is_file(follow_symlinks=False):
+                    continue
+                file_age = current_time - entry.stat(follow_symlinks=False).st_mtime
+                if file_age > max_age_seconds:
+                    os.unlink(entry.path)
+                    deleted_count += 1
+                    logger.info(f"Deleted old file: {entry.path}")
                 
         if deleted_count > 0:
             logger.info(f"Cleaned up {deleted_count} old files.")
@@ -157,8 +270,8 @@ if __name__ == "__main__":
     print("Screen capture test...")
     print(f"Screen size: {get_screen_size()}")
     
-    filepath = capture_screen()
-    if filepath:
-        print(f"Success! File: {filepath}")
+    capture = capture_screen()
+    if capture and capture[2].result():
+        print(f"Success! File: {capture[0]}")
     else:
         print("Error occurred!")
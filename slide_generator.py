@@ -4,30 +4,377 @@ PowerPoint Slide Generator Module
 This module creates educational slides using the python-pptx library.
 A new presentation file is created for each session, and all screenshots
 during that session are added to the same file.
+
+Importing this module loads python-pptx (and lxml), which takes a while;
+main.py imports it on a background thread at startup (see _prewarm).
 """
 
+import atexit
+import copy
+import functools
+import hashlib
+import io
 import logging
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import zipfile
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
+import pptx.opc.serialized as _serialized
 from pptx import Presentation
+from pptx.opc.package import OpcPackage
+from pptx.opc.packuri import PackURI
+from pptx.package import Package
+from pptx.parts.image import Image as PptxImage, ImagePart
 from pptx.util import Inches, Pt
 from pptx.dml.color import RGBColor
-from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from pptx.enum.text import PP_ALIGN
+from pptx.oxml import parse_xml
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import nsdecls
 
 from config import (
+    CFG,
     OUTPUT_DIR,
+    RESOURCES_DIR,
     SLIDE_WIDTH_INCHES,
     SLIDE_HEIGHT_INCHES,
     IMAGE_WIDTH_INCHES,
     IMAGE_HEIGHT_INCHES,
-    TEXT_BOX_WIDTH_INCHES,
-    TEXT_BOX_HEIGHT_INCHES
+    AUTOSAVE_INTERVAL,
+    MAX_SLIDES_PER_FILE,
+    SLIDE_IMAGE_JPEG_MIN_BYTES,
+    SLIDE_IMAGE_JPEG_QUALITY,
+    SLIDE_IMAGE_DPI,
+    ensure_directories
 )
 
 # Setup logger
 logger = logging.getLogger(__name__)
 
+# =============================================================================
+# Layout Constants (computed once, shared by every slide)
+# =============================================================================
+
+# Font sizes
+_PT12 = Pt(12)
+_PT16 = Pt(16)
+_PT20 = Pt(20)
+_PT24 = Pt(24)
+_PT44 = Pt(44)
+
+# Colors
+_COLOR_BLUE = RGBColor(0x2E, 0x74, 0xB5)
+_COLOR_DARK_BLUE = RGBColor(0x1F, 0x49, 0x7D)
+_COLOR_RED = RGBColor(0xC0, 0x50, 0x4D)
+_COLOR_GRAY_TEXT = RGBColor(0x33, 0x33, 0x33)
+_COLOR_SUBTITLE_GRAY = RGBColor(0x66, 0x66, 0x66)
+
+# Slide dimensions
+_SLIDE_WIDTH = Inches(SLIDE_WIDTH_INCHES)
+_SLIDE_HEIGHT = Inches(SLIDE_HEIGHT_INCHES)
+
+# Title slide
+_COVER_LEFT = Inches(0.5)
+_COVER_WIDTH = Inches(SLIDE_WIDTH_INCHES - 1)
+_COVER_TITLE_TOP = Inches(2.5)
+_COVER_TITLE_HEIGHT = Inches(1.5)
+_COVER_SUBTITLE_TOP = Inches(4.0)
+_COVER_SUBTITLE_HEIGHT = Inches(1)
+
+# Slide title
+_TITLE_LEFT = Inches(0.3)
+_TITLE_TOP = Inches(0.2)
+_TITLE_WIDTH = Inches(SLIDE_WIDTH_INCHES - 0.6)
+_TITLE_HEIGHT = Inches(0.6)
+
+# Image (left side)
+_IMG_LEFT = Inches(0.3)
+_IMG_TOP = Inches(1.0)
+_IMG_WIDTH = Inches(IMAGE_WIDTH_INCHES)
+_IMG_HEIGHT = Inches(IMAGE_HEIGHT_INCHES)
+
+# Image (centered, larger)
+_FULL_IMG_WIDTH = Inches(11.0)
+_FULL_IMG_HEIGHT = Inches(5.8)
+_FULL_IMG_LEFT = Inches((SLIDE_WIDTH_INCHES - 11.0) / 2)
+_FULL_IMG_TOP = Inches(1.0)
+
+# Full-width text content
+_TEXT_LEFT = Inches(0.5)
+_TEXT_TOP = Inches(1.0)
+_TEXT_WIDTH = Inches(SLIDE_WIDTH_INCHES - 1.0)
+_TEXT_HEIGHT = Inches(6.0)
+
+# =============================================================================
+# Text Templates (parsed once, copied for every text box)
+# =============================================================================
+
+def _paragraph_xml(
+    size, color, bold=False, space_after=None, text=None, align=None
+) -> str:
+    """
+    Builds the XML of one styled paragraph (optionally with a text run).
+    """
+    spacing = ""
+    if space_after is not None:
+        spacing = f'<a:spcAft><a:spcPts val="{space_after.centipoints}"/></a:spcAft>'
+    align_attr = f' algn="{align.xml_value}"' if align is not None else ""
+    bold_attr = ' b="1"' if bold else ""
+    run = f"<a:r><a:t>{text}</a:t></a:r>" if text else ""
+    return (
+        f"<a:p><a:pPr{align_attr}>{spacing}"
+        f'<a:defRPr sz="{size.centipoints}"{bold_attr}>'
+        f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+        f"</a:defRPr></a:pPr>{run}</a:p>"
+    )
+
+
+def _text_body_xml(paragraphs: str, wrap: bool = False) -> str:
+    """
+    Builds the XML of a text box body (auto-fit, optionally word-wrapped).
+    """
+    wrap_value = "square" if wrap else "none"
+    return (
+        f"<p:txBody {nsdecls('a', 'p')}>"
+        f'<a:bodyPr wrap="{wrap_value}"><a:spAutoFit/></a:bodyPr><a:lstStyle/>'
+        f"{paragraphs}</p:txBody>"
+    )
+
+
+@functools.cache
+def _single_paragraph_template(size, color, bold, align):
+    """
+    Returns the parsed text body template for one text style.
+    """
+    return parse_xml(_text_body_xml(_paragraph_xml(size, color, bold=bold, align=align)))
+
+
+# Summary header, summary text, question header, question text
+_TEXT_CONTENT_TEMPLATE = parse_xml(_text_body_xml(
+    f"{_paragraph_xml(_PT24, _COLOR_BLUE, bold=True, space_after=_PT12, text='Summary')}"
+    f"{_paragraph_xml(_PT16, _COLOR_GRAY_TEXT, space_after=_PT24)}"
+    f"{_paragraph_xml(_PT24, _COLOR_RED, bold=True, space_after=_PT12, text='Multiple Choice Question')}"
+    f"{_paragraph_xml(_PT16, _COLOR_GRAY_TEXT)}",
+    wrap=True
+))
+
+
+def _add_text_box(slide, left, top, width, height, tx_body):
+    """
+    Adds a text box whose body is replaced by `tx_body` in one step.
+    """
+    text_box = slide.shapes.add_textbox(left, top, width, height)
+    shape = text_box._element
+    shape.replace(shape.txBody, tx_body)
+    return text_box
+
+
+def _styled_textbox(
+    slide, left, top, width, height, text: str, size, color, bold=False, align=None
+):
+    """
+    Adds a text box with a single styled paragraph.
+    
+    Args:
+        slide: Slide to add the text box to
+        left, top, width, height: Text box position and size
+        text: Paragraph text
+        size: Font size
+        color: Font color
+        bold: Bold font
+        align: Paragraph alignment (None = default)
+        
+    Returns:
+        Shape: The added text box
+    """
+    tx_body = copy.deepcopy(_single_paragraph_template(size, color, bold, align))
+    tx_body.p_lst[0].append_text(text)
+    return _add_text_box(slide, left, top, width, height, tx_body)
+
+# Summary length on the notes slide (full width allows more characters)
+_MAX_SUMMARY_CHARS = 800
+_ELLIPSIS = "..."
+
+# Number of recently used image files kept in memory
+_IMAGE_CACHE_SIZE = 32
+
+# PowerPoint COM export script (takes -Pptx and -Pdf parameters)
+_EXPORT_SCRIPT = RESOURCES_DIR / "export_pdf.ps1"
+
+# LibreOffice user profile used for headless conversions
+_SOFFICE_PROFILE_DIR = Path(tempfile.gettempdir()) / "snaplearn-soffice"
+
+# Writer thread messages
+_SAVE = object()
+_STOP = object()
+
+
+# =============================================================================
+# Package Compression
+# =============================================================================
+
+# Embedded media (PNG/JPEG) is already compressed, DEFLATE only costs CPU
+_MEDIA_PREFIX = "ppt/media/"
+_XML_COMPRESS_LEVEL = 1
+
+
+def _write_zip_member(self, pack_uri, blob: bytes):
+    """
+    Replacement for python-pptx's zip writer: stores media uncompressed
+    and deflates XML parts with the fastest compression level.
+    """
+    name = pack_uri.membername
+    if name.startswith(_MEDIA_PREFIX):
+        self._zipf.writestr(name, blob, compress_type=zipfile.ZIP_STORED)
+    else:
+        self._zipf.writestr(
+            name,
+            blob,
+            compress_type=zipfile.ZIP_DEFLATED,
+            compresslevel=_XML_COMPRESS_LEVEL
+        )
+
+
+_serialized._ZipPkgWriter.write = _write_zip_member
+
+
+# =============================================================================
+# Part Naming
+# =============================================================================
+
+def _next_part_index(package, prefix: str) -> int:
+    """
+    Returns the next free index for partnames starting with `prefix`.
+    The package is scanned only on the first call per prefix, after that
+    a counter stored on the package is incremented.
+    """
+    counters = package.__dict__.setdefault("_snaplearn_part_counters", {})
+    
+    idx = counters.get(prefix)
+    if idx is None:
+        idx = 1 + max(
+            (
+                part.partname.idx for part in package.iter_parts()
+                if part.partname.startswith(prefix) and part.partname.idx is not None
+            ),
+            default=0
+        )
+    
+    counters[prefix] = idx + 1
+    return idx
+
+
+def _next_partname(self, tmpl: str) -> PackURI:
+    """
+    Replacement for OpcPackage.next_partname, which scans every part of
+    the package on each call (quadratic over a long session).
+    """
+    prefix = tmpl[: (tmpl % 42).find("42")]
+    return PackURI(tmpl % _next_part_index(self, prefix))
+
+
+def _next_image_partname(self, ext: str) -> PackURI:
+    """
+    Replacement for Package.next_image_partname (same full scan per image).
+    """
+    return PackURI("/ppt/media/image%d.%s" % (_next_part_index(self, "/ppt/media/image"), ext))
+
+
+OpcPackage.next_partname = _next_partname
+Package.next_image_partname = _next_image_partname
+
+
+# =============================================================================
+# Image Re-encoding
+# =============================================================================
+
+def _should_transcode(image_path: Path, raw: bytes) -> bool:
+    """
+    Returns True if a screenshot should be embedded as JPEG instead of PNG.
+    """
+    return (
+        Path(image_path).suffix.lower() == ".png"
+        and len(raw) > SLIDE_IMAGE_JPEG_MIN_BYTES
+    )
+
+
+def _transcode_to_jpeg(raw: bytes, width, height) -> bytes:
+    """
+    Re-encodes PNG image bytes as JPEG, downscaled to the picture size on
+    the slide at SLIDE_IMAGE_DPI.
+    
+    Args:
+        raw: PNG file contents
+        width: Width of the picture on the slide
+        height: Height of the picture on the slide
+        
+    Returns:
+        bytes: JPEG file contents (the original bytes on error)
+    """
+    try:
+        from PIL import Image
+        
+        max_size = (
+            round(width.inches * SLIDE_IMAGE_DPI),
+            round(height.inches * SLIDE_IMAGE_DPI)
+        )
+        
+        with Image.open(io.BytesIO(raw)) as image:
+            image = image.convert("RGB")
+            image.thumbnail(max_size, Image.LANCZOS)
+            
+            buffer = io.BytesIO()
+            image.save(
+                buffer,
+                format="JPEG",
+                quality=SLIDE_IMAGE_JPEG_QUALITY,
+                optimize=True,
+                progressive=False
+            )
+        
+        return buffer.getvalue()
+        
+    except Exception as e:
+        logger.warning(f"JPEG re-encoding failed, embedding the original image: {e}")
+        return raw
+
+
+# =============================================================================
+# Base Presentation
+# =============================================================================
+
+# Presentation attributes cached on first access (see _base_presentation)
+_CACHED_COLLECTIONS = frozenset({"slides", "slide_masters"})
+
+
+@functools.cache
+def _base_presentation():
+    """
+    Returns the empty presentation (default layouts, 16:9 slide size)
+    that every new presentation file is copied from.
+    
+    Only ever pass this to copy.deepcopy() - do not read any attribute of
+    it. python-pptx caches collections such as ``slides`` and
+    ``slide_masters`` on first access, holding child elements of the XML
+    tree; deepcopy() copies those as detached trees and every copy is
+    then saved with duplicate slide parts and an empty slide list.
+    """
+    presentation = Presentation()
+    
+    # Set slide dimensions (16:9 widescreen)
+    presentation.slide_width = _SLIDE_WIDTH
+    presentation.slide_height = _SLIDE_HEIGHT
+    
+    return presentation
+
 
 class SlideGenerator:
     """
@@ -35,72 +382,137 @@ class SlideGenerator:
     
     Creates a unique presentation file for each session and
     manages adding new slides to it.
+    
+    Long sessions are split into several files: after
+    `max_slides_per_file` captures the current file is saved and a new
+    one (same name with a _2, _3, ... suffix) is started.
+    
+    Slides are kept in memory and written to disk every
+    `autosave_interval` slides, on flush(), and on close(). Saves run on
+    a background writer thread; bursts of save requests are coalesced
+    into a single write. Can be used as a context manager to guarantee
+    the final save:
+    
+        with SlideGenerator() as generator:
+            generator.add_direct_slide(image_path)
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        autosave_interval: int | None = AUTOSAVE_INTERVAL,
+        max_slides_per_file: int | None = MAX_SLIDES_PER_FILE
+    ):
         """
         Creates a new SlideGenerator instance.
         Automatically starts a new presentation.
+        
+        Args:
+            autosave_interval: Save after this many new slides
+                (None = only on flush/close)
+            max_slides_per_file: Start a new file after this many captures
+                (None = keep everything in one file)
         """
         self.presentation = None
         self.filepath = None
         self.slide_count = 0
+        self.max_slides_per_file = max_slides_per_file
+        self._file_slide_count = 0
+        self._filepaths: list[Path] = []
+        self._session_timestamp = None
+        self._session_date = None
+        self._blank_layout = None
+        self._slides = None
+        self.autosave_interval = autosave_interval
+        self._slides_since_flush = 0
+        self._image_bytes_cache: OrderedDict[str, tuple[bytes, str]] = OrderedDict()
+        self._image_parts = {}
         self._create_new_presentation()
+        
+        # Background writer; the lock keeps saves and slide edits apart
+        # since python-pptx objects are not thread-safe
+        self._save_lock = threading.Lock()
+        self._save_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._closed = False
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="pptx-writer",
+            daemon=True
+        )
+        self._writer.start()
+        
+        # Make sure pending slides are written when the interpreter exits
+        atexit.register(self.close)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
     
     def _create_new_presentation(self):
         """
         Creates a new empty presentation with a session-specific filename.
         """
-        # Create new presentation
-        self.presentation = Presentation()
+        # Copy the pre-built empty presentation (much faster than parsing
+        # the default template again for every file)
+        base = _base_presentation()
+        assert not _CACHED_COLLECTIONS & base.__dict__.keys(), "base presentation was accessed"
+        self.presentation = copy.deepcopy(base)
+        
+        # Cache the blank layout (index 6 is typically blank) and the slide
+        # collection instead of resolving them for every slide
+        self._blank_layout = self.presentation.slide_layouts[6]
+        self._slides = self.presentation.slides
+        
+        # Image parts of this presentation by SHA1 of their bytes
+        self._image_parts = {}
         
-        # Set slide dimensions (16:9 widescreen)
-        self.presentation.slide_width = Inches(SLIDE_WIDTH_INCHES)
-        self.presentation.slide_height = Inches(SLIDE_HEIGHT_INCHES)
+        # Create unique filename for this session (later parts get a suffix)
+        ensure_directories()
+        if self._session_timestamp is None:
+            now = datetime.now()
+            self._session_timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
+            self._session_date = now.strftime("%B %d, %Y")
+            self.filepath = OUTPUT_DIR / f"presentation_{self._session_timestamp}.pptx"
+        else:
+            part = len(self._filepaths) + 1
+            self.filepath = OUTPUT_DIR / f"presentation_{self._session_timestamp}_{part}.pptx"
+        self._filepaths.append(self.filepath)
         
-        # Create unique filename for this session
-        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        self.filepath = OUTPUT_DIR / f"presentation_{timestamp}.pptx"
+        # Path strings used by every save, computed once per file
+        self._filepath_str = str(self.filepath)
+        self._tmp_filepath_str = f"{self._filepath_str}.tmp"
+        self._file_slide_count = 0
         
         # Add title slide
-        self._add_title_slide()
+        self._add_title_slide(self._session_date)
         
         logger.info(f"New presentation created: {self.filepath}")
     
-    def _add_title_slide(self):
+    def _add_title_slide(self, date_str: str):
         """
         Adds a title slide to the presentation.
+        
+        Args:
+            date_str: Formatted session date shown in the subtitle
         """
-        # Use blank slide layout (index 6 is typically blank)
-        slide_layout = self.presentation.slide_layouts[6]
-        slide = self.presentation.slides.add_slide(slide_layout)
+        slide = self._slides.add_slide(self._blank_layout)
         
         # Title text box
-        left = Inches(0.5)
-        top = Inches(2.5)
-        width = Inches(SLIDE_WIDTH_INCHES - 1)
-        height = Inches(1.5)
-        
-        title_box = slide.shapes.add_textbox(left, top, width, height)
-        title_frame = title_box.text_frame
-        title_para = title_frame.paragraphs[0]
-        title_para.text = "Educational Notes"
-        title_para.font.size = Pt(44)
-        title_para.font.bold = True
-        title_para.font.color.rgb = RGBColor(0x2E, 0x74, 0xB5)  # Blue
-        title_para.alignment = PP_ALIGN.CENTER
+        _styled_textbox(
+            slide,
+            _COVER_LEFT, _COVER_TITLE_TOP, _COVER_WIDTH, _COVER_TITLE_HEIGHT,
+            "Educational Notes",
+            _PT44, _COLOR_BLUE, bold=True, align=PP_ALIGN.CENTER
+        )
         
         # Subtitle
-        subtitle_top = Inches(4.0)
-        subtitle_box = slide.shapes.add_textbox(left, subtitle_top, width, Inches(1))
-        subtitle_frame = subtitle_box.text_frame
-        subtitle_para = subtitle_frame.paragraphs[0]
-        
-        date_str = datetime.now().strftime("%B %d, %Y")
-        subtitle_para.text = f"Auto-generated - {date_str}"
-        subtitle_para.font.size = Pt(20)
-        subtitle_para.font.color.rgb = RGBColor(0x66, 0x66, 0x66)  # Gray
-        subtitle_para.alignment = PP_ALIGN.CENTER
+        _styled_textbox(
+            slide,
+            _COVER_LEFT, _COVER_SUBTITLE_TOP, _COVER_WIDTH, _COVER_SUBTITLE_HEIGHT,
+            f"Auto-generated - {date_str}",
+            _PT20, _COLOR_SUBTITLE_GRAY, align=PP_ALIGN.CENTER
+        )
         
         logger.info("Title slide added.")
     
@@ -124,117 +536,126 @@ class SlideGenerator:
             int: The slide number that was added
         """
         try:
-            self.slide_count += 1
-            
-            # Slide title
-            if slide_title is None:
-                slide_title = f"Slide {self.slide_count}"
+            with self._save_lock:
+                slide_number = self._add_content_slides(
+                    image_path, summary, question, slide_title
+                )
             
-            # === SLIDE 1: Full-screen image ===
-            slide_layout = self.presentation.slide_layouts[6]
-            image_slide = self.presentation.slides.add_slide(slide_layout)
+            logger.info("Content slides #%d added (image + text).", slide_number)
             
-            self._add_slide_title(image_slide, slide_title)
-            self._add_full_image(image_slide, image_path)
+            return slide_number
             
-            # === SLIDE 2: Summary and Question ===
-            text_slide = self.presentation.slides.add_slide(slide_layout)
+        except Exception as e:
+            logger.error(f"Error adding slide: {e}")
+            raise
+    
+    def bulk_add(self, items: list[tuple[Path, str, str, str | None]]) -> list[int]:
+        """
+        Adds content slides for several captures and saves once at the end
+        (instead of autosaving in between).
+        
+        Args:
+            items: (image_path, summary, question, slide_title) tuples;
+                slide_title is optional and may be None
             
-            self._add_slide_title(text_slide, f"{slide_title} - Notes")
-            self._add_full_text_content(text_slide, summary, question)
+        Returns:
+            list[int]: The slide numbers that were added
+        """
+        try:
+            with self._save_lock:
+                slide_numbers = [
+                    self._add_content_slides(*item, autosave=False)
+                    for item in items
+                ]
             
-            # Save presentation
-            self._save()
+            self.flush()
             
-            logger.info(f"Content slides #{self.slide_count} added (image + text).")
+            logger.info("%d content slides added (image + text).", len(slide_numbers))
             
-            return self.slide_count
+            return slide_numbers
             
         except Exception as e:
-            logger.error(f"Error adding slide: {e}")
+            logger.error(f"Error adding slides: {e}")
             raise
     
+    def _add_content_slides(
+        self,
+        image_path: Path,
+        summary: str,
+        question: str,
+        slide_title: str = None,
+        autosave: bool = True
+    ) -> int:
+        """
+        Adds the image slide and the notes slide of one capture.
+        Called with the save lock held.
+        
+        Returns:
+            int: The slide number that was added
+        """
+        self._start_next_file_if_full()
+        self.slide_count += 1
+        
+        # Slide title
+        if slide_title is None:
+            slide_title = f"Slide {self.slide_count}"
+        
+        # === SLIDE 1: Full-screen image ===
+        image_slide = self._slides.add_slide(self._blank_layout)
+        
+        self._add_slide_title(image_slide, slide_title)
+        self._add_full_image(image_slide, image_path)
+        
+        # === SLIDE 2: Summary and Question ===
+        text_slide = self._slides.add_slide(self._blank_layout)
+        
+        self._add_slide_title(text_slide, f"{slide_title} - Notes")
+        self._add_full_text_content(text_slide, summary, question)
+        
+        self._slide_added(autosave)
+        
+        return self.slide_count
+    
     def _add_slide_title(self, slide, title: str):
         """
         Adds a title to the slide.
         """
-        left = Inches(0.3)
-        top = Inches(0.2)
-        width = Inches(SLIDE_WIDTH_INCHES - 0.6)
-        height = Inches(0.6)
-        
-        title_box = slide.shapes.add_textbox(left, top, width, height)
-        title_frame = title_box.text_frame
-        title_para = title_frame.paragraphs[0]
-        title_para.text = title
-        title_para.font.size = Pt(24)
-        title_para.font.bold = True
-        title_para.font.color.rgb = RGBColor(0x1F, 0x49, 0x7D)  # Dark blue
+        _styled_textbox(
+            slide,
+            _TITLE_LEFT, _TITLE_TOP, _TITLE_WIDTH, _TITLE_HEIGHT,
+            title,
+            _PT24, _COLOR_DARK_BLUE, bold=True
+        )
     
     def _add_image(self, slide, image_path: Path):
         """
         Adds an image to the left side of the slide.
         """
-        # Image position (left side)
-        left = Inches(0.3)
-        top = Inches(1.0)
-        
-        # Add and resize image
-        picture = slide.shapes.add_picture(
-            str(image_path),
-            left,
-            top,
-            width=Inches(IMAGE_WIDTH_INCHES),
-            height=Inches(IMAGE_HEIGHT_INCHES)
+        # Add and resize image (left side)
+        self._add_picture(
+            slide, image_path, _IMG_LEFT, _IMG_TOP, _IMG_WIDTH, _IMG_HEIGHT
         )
         
-        logger.debug(f"Image added: {image_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Image added: %s", image_path)
     
     def _add_full_text_content(self, slide, summary: str, question: str):
         """
         Adds summary and question text as full-width content on a dedicated slide.
         """
-        # Text box position (full width, centered)
-        left = Inches(0.5)
-        top = Inches(1.0)
-        width = Inches(SLIDE_WIDTH_INCHES - 1.0)
-        height = Inches(6.0)
-        
-        text_box = slide.shapes.add_textbox(left, top, width, height)
-        text_frame = text_box.text_frame
-        text_frame.word_wrap = True
-        
-        # Summary header
-        p1 = text_frame.paragraphs[0]
-        p1.text = "Summary"
-        p1.font.size = Pt(24)
-        p1.font.bold = True
-        p1.font.color.rgb = RGBColor(0x2E, 0x74, 0xB5)
-        p1.space_after = Pt(12)
-        
-        # Summary text
-        p2 = text_frame.add_paragraph()
-        # Allow more characters since we have full width
-        max_chars = 800
-        display_summary = summary[:max_chars] + "..." if len(summary) > max_chars else summary
-        p2.text = display_summary
-        p2.font.size = Pt(16)
-        p2.font.color.rgb = RGBColor(0x33, 0x33, 0x33)
-        p2.space_after = Pt(24)
-        
-        # Question header
-        p3 = text_frame.add_paragraph()
-        p3.text = "Multiple Choice Question"
-        p3.font.size = Pt(24)
-        p3.font.bold = True
-        p3.font.color.rgb = RGBColor(0xC0, 0x50, 0x4D)  # Red
-        p3.space_after = Pt(12)
-        
-        # Question text
-        p4 = text_frame.add_paragraph()
-        p4.text = question
-        p4.font.size = Pt(16)
-        p4.font.color.rgb = RGBColor(0x33, 0x33, 0x33)
+        # Pre-styled paragraphs (headers included), only the texts are added
+        tx_body = copy.deepcopy(_TEXT_CONTENT_TEMPLATE)
+        _, summary_para, _, question_para = tx_body.p_lst
+        
+        if len(summary) > _MAX_SUMMARY_CHARS:
+            display_summary = summary[:_MAX_SUMMARY_CHARS] + _ELLIPSIS
+        else:
+            display_summary = summary
+        summary_para.append_text(display_summary)
+        question_para.append_text(question)
+        
+        # Text box (full width, centered)
+        _add_text_box(slide, _TEXT_LEFT, _TEXT_TOP, _TEXT_WIDTH, _TEXT_HEIGHT, tx_body)
         
         logger.debug("Full text content added.")
     
@@ -251,25 +672,25 @@ class SlideGenerator:
             int: The slide number that was added
         """
         try:
-            self.slide_count += 1
-            
-            # Use blank slide layout
-            slide_layout = self.presentation.slide_layouts[6]
-            slide = self.presentation.slides.add_slide(slide_layout)
-            
-            # Slide title
-            if slide_title is None:
-                slide_title = f"Slide {self.slide_count} (Direct Capture)"
-            
-            self._add_slide_title(slide, slide_title)
+            with self._save_lock:
+                self._start_next_file_if_full()
+                self.slide_count += 1
+                
+                # Use blank slide layout
+                slide = self._slides.add_slide(self._blank_layout)
+                
+                # Slide title
+                if slide_title is None:
+                    slide_title = f"Slide {self.slide_count} (Direct Capture)"
+                
+                self._add_slide_title(slide, slide_title)
+                
+                # Add image (larger, centered)
+                self._add_full_image(slide, image_path)
+                
+                self._slide_added()
             
-            # Add image (larger, centered)
-            self._add_full_image(slide, image_path)
-            
-            # Save presentation
-            self._save()
-            
-            logger.info(f"Direct capture slide #{self.slide_count} added.")
+            logger.info("Direct capture slide #%d added.", self.slide_count)
             
             return self.slide_count
             
@@ -281,32 +702,197 @@ class SlideGenerator:
         """
         Adds a larger image centered on the slide (for direct capture).
         """
-        # Image position (centered, larger)
-        img_width = Inches(11.0)
-        img_height = Inches(5.8)
-        left = Inches((SLIDE_WIDTH_INCHES - 11.0) / 2)
-        top = Inches(1.0)
-        
-        # Add and resize image
-        picture = slide.shapes.add_picture(
-            str(image_path),
-            left,
-            top,
-            width=img_width,
-            height=img_height
+        # Add and resize image (centered, larger)
+        self._add_picture(
+            slide,
+            image_path,
+            _FULL_IMG_LEFT,
+            _FULL_IMG_TOP,
+            _FULL_IMG_WIDTH,
+            _FULL_IMG_HEIGHT
         )
         
-        logger.debug(f"Full image added: {image_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full image added: %s", image_path)
+    
+    def _add_picture(self, slide, image_path: Path, left, top, width, height):
+        """
+        Adds a picture to the slide. Every image is stored once per
+        presentation: a screenshot that is already embedded is linked to
+        its existing image part instead of being hashed, looked up and
+        added again. All pictures are added here, so `_image_parts` is the
+        complete list of image parts and new images skip python-pptx's
+        scan over every part of the package.
+        
+        Args:
+            slide: Slide to add the picture to
+            image_path: Path to the image file
+            left, top, width, height: Picture position and size
+            
+        Returns:
+            Picture: The added picture shape
+        """
+        raw, sha1 = self._image_bytes(image_path, width, height)
+        shapes = slide.shapes
+        
+        image_part = self._image_parts.get(sha1)
+        if image_part is None:
+            # Keep the screenshot's filename (python-pptx uses it as the
+            # picture description / alt text)
+            image = PptxImage.from_blob(raw, filename=Path(image_path).name)
+            image_part = ImagePart.new(slide.part.package, image)
+            self._image_parts[sha1] = image_part
+        rId = slide.part.relate_to(image_part, RT.IMAGE)
+        
+        pic = shapes._add_pic_from_image_part(image_part, rId, left, top, width, height)
+        shapes._recalculate_extents()
+        return shapes._shape_factory(pic)
+    
+    def _image_bytes(self, image_path: Path, width, height) -> tuple[bytes, str]:
+        """
+        Returns the image file contents and their SHA1 hex digest.
+        Recently used files are served from an LRU cache, so adding the
+        same screenshot again does not read or hash it a second time.
+        
+        Args:
+            image_path: Path to the image file
+            width: Width of the picture on the slide
+            height: Height of the picture on the slide
+            
+        Returns:
+            tuple: (image_bytes, sha1_hex)
+        """
+        key = str(image_path)
+        if CFG.slide_image_jpeg:
+            # Re-encoded bytes depend on the target size
+            key = f"{key}|{width}x{height}"
+        cache = self._image_bytes_cache
+        
+        entry = cache.get(key)
+        if entry is None:
+            raw = Path(image_path).read_bytes()
+            if CFG.slide_image_jpeg and _should_transcode(image_path, raw):
+                raw = _transcode_to_jpeg(raw, width, height)
+            entry = cache[key] = (raw, hashlib.sha1(raw).hexdigest())
+            if len(cache) > _IMAGE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        
+        return entry
+    
+    def _start_next_file_if_full(self):
+        """
+        Saves the current file and starts the next one once it holds
+        `max_slides_per_file` captures. Keeps every file small, since
+        adding slides and saving get slower as a presentation grows.
+        Called with the save lock held.
+        """
+        if not self.max_slides_per_file or self._file_slide_count < self.max_slides_per_file:
+            return
+        
+        if self._slides_since_flush:
+            self._save()
+            self._slides_since_flush = 0
+        
+        self._create_new_presentation()
+    
+    def _slide_added(self, autosave: bool = True):
+        """
+        Records a new slide and requests a save if the autosave interval
+        is reached. Called with the save lock held.
+        
+        Args:
+            autosave: Whether this slide may trigger an autosave
+        """
+        self._file_slide_count += 1
+        self._slides_since_flush += 1
+        
+        if autosave and self.autosave_interval and self._slides_since_flush >= self.autosave_interval:
+            if self._closed:
+                # No writer thread after close(); save here directly since
+                # flush() would try to take the save lock again
+                self._save()
+                self._slides_since_flush = 0
+            else:
+                self.flush()
+    
+    def flush(self, wait: bool = False):
+        """
+        Writes the presentation to disk if slides were added since the
+        last save.
+        
+        Args:
+            wait: Save on the calling thread and return when the file is
+                written (default: hand the save to the writer thread)
+        """
+        if wait or self._closed:
+            self._save_pending()
+            return
+        
+        try:
+            self._save_queue.put_nowait(_SAVE)
+        except queue.Full:
+            # A save is already queued and will include these slides
+            pass
+    
+    def close(self):
+        """
+        Saves pending slides and stops the writer thread.
+        Called automatically at interpreter exit.
+        """
+        if self._closed:
+            return
+        
+        try:
+            self._save_queue.put(_STOP)
+            self._writer.join()
+        finally:
+            self._closed = True
+            atexit.unregister(self.close)
+    
+    def _writer_loop(self):
+        """
+        Saves the presentation whenever a save is requested (writer thread).
+        """
+        while True:
+            message = self._save_queue.get()
+            
+            try:
+                self._save_pending()
+            except Exception:
+                # Already logged by _save(), keep the writer alive
+                pass
+            
+            if message is _STOP:
+                break
+    
+    def _save_pending(self):
+        """
+        Saves the presentation if slides were added since the last save.
+        """
+        with self._save_lock:
+            if self._slides_since_flush == 0:
+                return
+            
+            self._save()
+            self._slides_since_flush = 0
     
     def _save(self):
         """
         Saves the presentation to file.
+        Writes to a temporary file first and swaps it in, so an interrupted
+        save never leaves a corrupted presentation behind.
         """
+        tmp_path = self._tmp_filepath_str
+        
         try:
-            self.presentation.save(str(self.filepath))
-            logger.debug(f"Presentation saved: {self.filepath}")
+            self.presentation.save(tmp_path)
+            os.replace(tmp_path, self._filepath_str)
+            logger.debug("Presentation saved: %s", self.filepath)
         except Exception as e:
             logger.error(f"Error saving presentation: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
             raise
     
     def get_filepath(self) -> Path:
@@ -315,6 +901,20 @@ class SlideGenerator:
         """
         return self.filepath
     
+    def get_filepaths(self) -> list[Path]:
+        """
+        Returns the paths of all files of this session, in order.
+        """
+        return list(self._filepaths)
+    
+    def finalize(self) -> list[Path]:
+        """
+        Saves pending slides, stops the writer thread and returns the
+        paths of all files of this session.
+        """
+        self.close()
+        return self.get_filepaths()
+    
     def get_slide_count(self) -> int:
         """
         Returns the number of content slides added (excluding title slide).
@@ -357,6 +957,21 @@ def add_slide(image_path: Path, summary: str, question: str) -> int:
     return generator.add_content_slide(image_path, summary, question)
 
 
+def add_slides(items: list[tuple[Path, str, str, str | None]]) -> list[int]:
+    """
+    Adds content slides for several captures with a single save.
+    
+    Args:
+        items: (image_path, summary, question, slide_title) tuples;
+            slide_title is optional and may be None
+        
+    Returns:
+        list[int]: The slide numbers that were added
+    """
+    generator = get_generator()
+    return generator.bulk_add(items)
+
+
 def add_slide_direct(image_path: Path) -> int:
     """
     Adds a new slide with only the screenshot (no AI analysis).
@@ -371,6 +986,13 @@ def add_slide_direct(image_path: Path) -> int:
     return generator.add_direct_slide(image_path)
 
 
+def save_presentation():
+    """
+    Writes pending slides of the current presentation to disk.
+    """
+    get_generator().flush(wait=True)
+
+
 def get_current_filepath() -> Path:
     """
     Returns the current presentation file path.
@@ -379,26 +1001,158 @@ def get_current_filepath() -> Path:
     return generator.get_filepath()
 
 
+def get_session_filepaths() -> list[Path]:
+    """
+    Returns the paths of all presentation files of the current session
+    (more than one when a long session was split).
+    """
+    generator = get_generator()
+    return generator.get_filepaths()
+
+
 def reset_session():
     """
     Starts a new session (creates a new presentation file).
     """
     global _generator
+    if _generator is not None:
+        _generator.close()
     _generator = SlideGenerator()
     return _generator.get_filepath()
 
 
+def _find_libreoffice() -> str | None:
+    """
+    Returns the LibreOffice executable, or None if it is not installed.
+    """
+    return shutil.which("soffice") or shutil.which("libreoffice")
+
+
+def _export_with_libreoffice(soffice: str, pptx_path: Path, pdf_path: Path) -> bool:
+    """
+    Converts the presentation with headless LibreOffice.
+    
+    Args:
+        soffice: LibreOffice executable
+        pptx_path: Presentation to convert
+        pdf_path: Expected PDF output path
+        
+    Returns:
+        bool: True if the PDF was created
+    """
+    try:
+        result = subprocess.run(
+            [
+                soffice,
+                # Dedicated profile: works while the user has LibreOffice
+                # open and is reused (warm) by later conversions
+                f"-env:UserInstallation={_SOFFICE_PROFILE_DIR.as_uri()}",
+                "--headless",
+                "--norestore",
+                "--convert-to", "pdf",
+                "--outdir", str(pdf_path.parent),
+                str(pptx_path)
+            ],
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except subprocess.TimeoutExpired:
+        logger.error("LibreOffice PDF export timed out!")
+        return False
+    
+    if result.returncode == 0 and pdf_path.exists():
+        return True
+    
+    logger.warning(f"LibreOffice PDF export failed: {result.stderr}")
+    return False
+
+
+def _export_with_powerpoint(pptx_path: Path, pdf_path: Path) -> bool:
+    """
+    Converts the presentation with PowerPoint COM automation (Windows).
+    
+    Args:
+        pptx_path: Presentation to convert
+        pdf_path: PDF output path
+        
+    Returns:
+        bool: True if the PDF was created
+    """
+    try:
+        # Use PowerPoint COM automation via the bundled PowerShell script
+        # (-NoProfile skips loading the user's profile on startup)
+        result = subprocess.run(
+            [
+                "powershell",
+                "-NoProfile",
+                "-ExecutionPolicy", "Bypass",
+                "-File", str(_EXPORT_SCRIPT),
+                # Session files live in OUTPUT_DIR, which is already absolute
+                "-Pptx", str(pptx_path),
+                "-Pdf", str(pdf_path)
+            ],
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except subprocess.TimeoutExpired:
+        logger.error("PowerPoint PDF export timed out!")
+        return False
+    
+    if result.returncode == 0 and pdf_path.exists():
+        return True
+    
+    logger.error(f"PowerPoint PDF export failed: {result.stderr}")
+    return False
+
+
 def export_to_pdf() -> Path | None:
     """
-    Exports the current presentation to PDF format.
-    Uses PowerPoint COM automation on Windows.
+    Exports the current presentation to PDF format (one PDF per file when
+    the session was split into several files).
+    Uses headless LibreOffice when installed (fast startup, any platform)
+    and falls back to PowerPoint COM automation on Windows.
     
     Returns:
-        Path | None: Path to the PDF file or None on error
+        Path | None: Path to the (first) PDF file or None on error
+    """
+    pptx_count = len(get_session_filepaths())
+    pdf_paths = export_session_to_pdf()
+    
+    if pdf_paths and len(pdf_paths) == pptx_count:
+        return pdf_paths[0]
+    return None
+
+
+def export_session_to_pdf() -> list[Path]:
+    """
+    Exports every presentation file of the current session to PDF.
+    
+    Returns:
+        list[Path]: Paths of the PDF files that were created, in order
     """
     generator = get_generator()
-    pptx_path = generator.get_filepath()
     
+    # Write pending slides before converting
+    generator.flush(wait=True)
+    
+    # Long sessions are split into several files, convert each of them
+    pdf_paths = [_export_file_to_pdf(path) for path in generator.get_filepaths()]
+    
+    return [path for path in pdf_paths if path is not None]
+
+
+def _export_file_to_pdf(pptx_path: Path) -> Path | None:
+    """
+    Exports one presentation file to PDF format.
+    
+    Args:
+        pptx_path: Presentation to convert
+        
+    Returns:
+        Path | None: Path to the PDF file or None on error
+    """
     if not pptx_path.exists():
         logger.error("Presentation file does not exist!")
         return None
@@ -406,42 +1160,23 @@ def export_to_pdf() -> Path | None:
     pdf_path = pptx_path.with_suffix('.pdf')
     
     try:
-        import subprocess
-        import sys
+        soffice = _find_libreoffice()
+        if soffice and _export_with_libreoffice(soffice, pptx_path, pdf_path):
+            logger.info(f"PDF exported with LibreOffice: {pdf_path}")
+            return pdf_path
         
         if sys.platform == "win32":
-            # Use PowerPoint COM automation via PowerShell
-            ps_script = f'''
-$pptx = "{pptx_path.absolute()}"
-$pdf = "{pdf_path.absolute()}"
-$powerpoint = New-Object -ComObject PowerPoint.Application
-$powerpoint.Visible = [Microsoft.Office.Core.MsoTriState]::msoFalse
-$presentation = $powerpoint.Presentations.Open($pptx, [Microsoft.Office.Core.MsoTriState]::msoTrue, [Microsoft.Office.Core.MsoTriState]::msoFalse, [Microsoft.Office.Core.MsoTriState]::msoFalse)
-$presentation.SaveAs($pdf, 32)
-$presentation.Close()
-$powerpoint.Quit()
-'''
-            # Run PowerShell script
-            result = subprocess.run(
-                ["powershell", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode == 0 and pdf_path.exists():
+            if _export_with_powerpoint(pptx_path, pdf_path):
                 logger.info(f"PDF exported: {pdf_path}")
                 return pdf_path
-            else:
-                logger.error(f"PDF export failed: {result.stderr}")
-                return None
-        else:
-            logger.warning("PDF export is only supported on Windows with PowerPoint installed.")
             return None
-            
-    except subprocess.TimeoutExpired:
-        logger.error("PDF export timed out!")
+        
+        if soffice is None:
+            logger.warning(
+                "PDF export requires LibreOffice (or PowerPoint on Windows)."
+            )
         return None
+            
     except Exception as e:
         logger.error(f"PDF export error: {e}")
         return None
@@ -461,7 +1196,6 @@ if __name__ == "__main__":
     print("Slide generator test...")
     
     # Create test presentation
-    generator = SlideGenerator()
-    
-    print(f"Presentation file: {generator.get_filepath()}")
+    with SlideGenerator() as generator:
+        print(f"Presentation file: {generator.get_filepath()}")
     print("Test successful! (A real image file is needed to add content slides)")